@@ -6,7 +6,11 @@ Cost per Success, ASR, VPD, Coordination Overhead. Writes results/summary_v1.jso
 
 import json
 import os
-from collections import defaultdict
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+
+from jsonio import dump_path, load_path
 
 _BASE = os.path.dirname(os.path.abspath(__file__))
 RUNS_DIR = os.path.join(_BASE, "runs")
@@ -19,46 +23,64 @@ def load_runs():
     """Load all JSON files from runs/ and return list of result dicts."""
     if not os.path.isdir(RUNS_DIR):
         return []
+    # scandir yields name + file type from one directory read; sort by name for stable output order.
+    with os.scandir(RUNS_DIR) as it:
+        entries = sorted((e for e in it if e.name.endswith(".json") and e.is_file()), key=lambda e: e.name)
     runs = []
-    for name in sorted(os.listdir(RUNS_DIR)):
-        if not name.endswith(".json"):
-            continue
-        path = os.path.join(RUNS_DIR, name)
+    for entry in entries:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                runs.append(json.load(f))
+            runs.append(load_path(entry.path))
         except (json.JSONDecodeError, OSError):
             continue
     return runs
 
 
+@lru_cache(maxsize=4)
+def _load_benchmark_version(path, mtime):
+    """Parse benchmark_version once per (path, mtime); a rewrite of the file invalidates the entry."""
+    try:
+        return load_path(path).get("benchmark_version", "sv-v1")
+    except (json.JSONDecodeError, OSError):
+        return "sv-v1"
+
+
 def get_benchmark_version():
     """Read benchmark_version from benchmark_v1.json if present."""
     try:
-        with open(BENCHMARK_PATH, "r", encoding="utf-8") as f:
-            return json.load(f).get("benchmark_version", "sv-v1")
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        mtime = os.path.getmtime(BENCHMARK_PATH)
+    except OSError:
         return "sv-v1"
+    return _load_benchmark_version(BENCHMARK_PATH, mtime)
 
 
-def percentile(sorted_values, p):
-    """Return p-th percentile (0–100). Uses linear interpolation."""
-    if not sorted_values:
+def p50(sorted_values):
+    """Median of an ascending list (linear interpolation); None if empty."""
+    n = len(sorted_values)
+    if n == 0:
         return None
+    i, odd = divmod(n - 1, 2)
+    if odd == 0:
+        return float(sorted_values[i])
+    lo = float(sorted_values[i])
+    return lo + 0.5 * (float(sorted_values[i + 1]) - lo)
+
+
+def p95(sorted_values):
+    """95th percentile of an ascending list (linear interpolation); None if empty."""
     n = len(sorted_values)
-    idx = (p / 100.0) * (n - 1)
-    i, frac = int(idx), idx % 1
+    if n == 0:
+        return None
+    idx = 0.95 * (n - 1)
+    i = int(idx)
     if i >= n - 1:
         return float(sorted_values[-1])
-    return float(sorted_values[i]) + frac * (float(sorted_values[i + 1]) - float(sorted_values[i]))
+    lo = float(sorted_values[i])
+    return lo + (idx - i) * (float(sorted_values[i + 1]) - lo)
 
 
-def asr_per_run(success, quality, constraint_adherence):
-    """Adjusted Success Rate for one run: SR × (quality/5) × constraint_adherence."""
-    s = 1.0 if success else 0.0
-    q = float(quality) if quality is not None else 0.0
-    c = float(constraint_adherence) if constraint_adherence is not None else 0.0
-    return s * (q / 5.0) * c
+def _round(x, ndigits):
+    """round() that passes None through; summary_v1.json keeps fixed precision per field."""
+    return None if x is None else round(x, ndigits)
 
 
 def aggregate(runs):
@@ -77,73 +99,93 @@ def aggregate(runs):
             "notable_failures": {},
         }
 
-    def m(r, key):
-        return (r.get("metrics") or {}).get(key)
+    # Single pass over runs: pull every per-run field into parallel columns once
+    # instead of re-scanning runs (and re-probing r["metrics"]) for each metric.
+    baseline_successes = swarm_successes = 0
+    wall_times = []
+    baseline_tokens, swarm_tokens = [], []
+    vals_q_b, vals_q_s, vals_c_b, vals_c_s = [], [], [], []
+    diffs_q, diffs_c = [], []
+    asr_baseline_total = asr_swarm_total = 0.0
+    failures = []  # (error_type, task_id) in run order
+    for r in runs:
+        metrics = r.get("metrics") or {}
+        baseline_ok = r.get("baseline_output") is not None
+        swarm_ok = r.get("swarm_output") is not None
+        baseline_successes += baseline_ok
+        swarm_successes += swarm_ok
+        wall_times.append(metrics["wall_time_seconds"])
+
+        bt = metrics.get("baseline_tokens_used")
+        st = metrics.get("swarm_tokens_used")
+        if bt is not None:
+            baseline_tokens.append(bt)
+        if st is not None:
+            swarm_tokens.append(st)
+
+        qb = metrics.get("baseline_quality_score")
+        qs = metrics.get("swarm_quality_score")
+        cb = metrics.get("baseline_constraint_adherence")
+        cs = metrics.get("swarm_constraint_adherence")
+        if qb is not None:
+            vals_q_b.append(qb)
+        if qs is not None:
+            vals_q_s.append(qs)
+        if qb is not None and qs is not None:
+            diffs_q.append(qs - qb)
+        if cb is not None:
+            vals_c_b.append(cb)
+        if cs is not None:
+            vals_c_s.append(cs)
+        if cb is not None and cs is not None:
+            diffs_c.append(cs - cb)
+
+        # ASR = SR × (quality/5) × constraint_adherence per run, then average. Use per-arm quality and
+        # constraint, falling back to the shared score only when the per-arm one is missing (a real 0
+        # must not fall through); a failed run or a missing score contributes 0.
+        q_any = metrics.get("quality_score")
+        c_any = metrics.get("constraint_adherence")
+        q = qb if qb is not None else q_any
+        c = cb if cb is not None else c_any
+        if baseline_ok and q is not None and c is not None:
+            asr_baseline_total += (float(q) / 5.0) * float(c)
+        q = qs if qs is not None else q_any
+        c = cs if cs is not None else c_any
+        if swarm_ok and q is not None and c is not None:
+            asr_swarm_total += (float(q) / 5.0) * float(c)
+
+        et = metrics.get("error_type")
+        if et:
+            failures.append((et, r["task_id"]))
 
-    baseline_successes = sum(1 for r in runs if r.get("baseline_output") is not None)
-    swarm_successes = sum(1 for r in runs if r.get("swarm_output") is not None)
     success_rate_baseline = baseline_successes / n
     success_rate_swarm = swarm_successes / n
 
-    wall_times = sorted(r["metrics"]["wall_time_seconds"] for r in runs)
-    p50_wall = percentile(wall_times, 50)
-    p95_wall = percentile(wall_times, 95)
+    wall_times.sort()
+    p50_wall = p50(wall_times)
+    p95_wall = p95(wall_times)
 
-    baseline_tokens = [r["metrics"].get("baseline_tokens_used") for r in runs]
-    swarm_tokens = [r["metrics"].get("swarm_tokens_used") for r in runs]
-    baseline_tokens = [t for t in baseline_tokens if t is not None]
-    swarm_tokens = [t for t in swarm_tokens if t is not None]
     avg_baseline_tokens = sum(baseline_tokens) / len(baseline_tokens) if baseline_tokens else None
     avg_swarm_tokens = sum(swarm_tokens) / len(swarm_tokens) if swarm_tokens else None
     token_delta = None
     if avg_baseline_tokens is not None and avg_swarm_tokens is not None:
         token_delta = avg_swarm_tokens - avg_baseline_tokens
 
-    quality_scores_b = [m(r, "baseline_quality_score") for r in runs]
-    quality_scores_s = [m(r, "swarm_quality_score") for r in runs]
-    constraint_b = [m(r, "baseline_constraint_adherence") for r in runs]
-    constraint_s = [m(r, "swarm_constraint_adherence") for r in runs]
-    pairs_q = [(b, s) for b, s in zip(quality_scores_b, quality_scores_s) if b is not None and s is not None]
-    pairs_c = [(b, s) for b, s in zip(constraint_b, constraint_s) if b is not None and s is not None]
-    quality_delta = None
-    if pairs_q:
-        quality_delta = sum(s - b for b, s in pairs_q) / len(pairs_q)
-    vals_q_b = [q for q in quality_scores_b if q is not None]
-    vals_q_s = [q for q in quality_scores_s if q is not None]
+    quality_delta = sum(diffs_q) / len(diffs_q) if diffs_q else None
     avg_quality_baseline = sum(vals_q_b) / len(vals_q_b) if vals_q_b else None
     avg_quality_swarm = sum(vals_q_s) / len(vals_q_s) if vals_q_s else None
-    constraint_delta = None
-    if pairs_c:
-        constraint_delta = sum(s - b for b, s in pairs_c) / len(pairs_c)
-    vals_c_b = [c for c in constraint_b if c is not None]
-    vals_c_s = [c for c in constraint_s if c is not None]
+    constraint_delta = sum(diffs_c) / len(diffs_c) if diffs_c else None
     avg_constraint_baseline = sum(vals_c_b) / len(vals_c_b) if vals_c_b else None
     avg_constraint_swarm = sum(vals_c_s) / len(vals_c_s) if vals_c_s else None
 
-    # ASR = SR × (quality/5) × constraint_adherence per run, then average. Use per-arm quality and constraint.
-    asr_baseline = sum(
-        asr_per_run(
-            r.get("baseline_output") is not None,
-            m(r, "baseline_quality_score") or m(r, "quality_score"),
-            m(r, "baseline_constraint_adherence") or m(r, "constraint_adherence"),
-        )
-        for r in runs
-    ) / n
-    asr_swarm = sum(
-        asr_per_run(
-            r.get("swarm_output") is not None,
-            m(r, "swarm_quality_score") or m(r, "quality_score"),
-            m(r, "swarm_constraint_adherence") or m(r, "constraint_adherence"),
-        )
-        for r in runs
-    ) / n
-
-    error_counts = defaultdict(list)
-    for r in runs:
-        et = r["metrics"].get("error_type")
-        if et:
-            error_counts[et].append(r["task_id"])
-    notable_failures = {k: {"count": len(v), "task_ids": v} for k, v in sorted(error_counts.items())}
+    asr_baseline = asr_baseline_total / n
+    asr_swarm = asr_swarm_total / n
+
+    # Stable sort keeps task_ids in run order within each error type.
+    notable_failures = {}
+    for et, group in groupby(sorted(failures, key=itemgetter(0)), key=itemgetter(0)):
+        task_ids = [task_id for _, task_id in group]
+        notable_failures[et] = {"count": len(task_ids), "task_ids": task_ids}
 
     # FPS: first-pass success (no retry); batch_runner does not set retry_count, so FPS = SR for now
     fps_baseline = success_rate_baseline
@@ -155,45 +197,45 @@ def aggregate(runs):
     # Coordination overhead: token and time delta (swarm − baseline)
     coordination_overhead = {}
     if token_delta is not None:
-        coordination_overhead["token_delta"] = round(token_delta, 2)
+        coordination_overhead["token_delta"] = _round(token_delta, 2)
     # Time delta would need per-arm wall time; we have combined wall_time_seconds per task. Omit or approximate.
 
     summary = {
         "benchmark_version": get_benchmark_version(),
         "task_count": n,
         "baseline_metrics": {
-            "success_rate": round(success_rate_baseline, 4),
-            "fps": round(fps_baseline, 4),
-            "avg_tokens_used": round(avg_baseline_tokens, 2) if avg_baseline_tokens is not None else None,
-            "asr": round(asr_baseline, 4),
+            "success_rate": _round(success_rate_baseline, 4),
+            "fps": _round(fps_baseline, 4),
+            "avg_tokens_used": _round(avg_baseline_tokens, 2),
+            "asr": _round(asr_baseline, 4),
         },
         "swarm_metrics": {
-            "success_rate": round(success_rate_swarm, 4),
-            "fps": round(fps_swarm, 4),
-            "avg_tokens_used": round(avg_swarm_tokens, 2) if avg_swarm_tokens is not None else None,
-            "asr": round(asr_swarm, 4),
+            "success_rate": _round(success_rate_swarm, 4),
+            "fps": _round(fps_swarm, 4),
+            "avg_tokens_used": _round(avg_swarm_tokens, 2),
+            "asr": _round(asr_swarm, 4),
         },
         "deltas": {
-            "quality_delta": round(quality_delta, 4) if quality_delta is not None else None,
-            "constraint_adherence_delta": round(constraint_delta, 4) if constraint_delta is not None else None,
-            "token_cost_delta": round(token_delta, 2) if token_delta is not None else None,
+            "quality_delta": _round(quality_delta, 4),
+            "constraint_adherence_delta": _round(constraint_delta, 4),
+            "token_cost_delta": _round(token_delta, 2),
         },
         "avg_quality": {
-            "baseline": round(avg_quality_baseline, 4) if avg_quality_baseline is not None else None,
-            "swarm": round(avg_quality_swarm, 4) if avg_quality_swarm is not None else None,
+            "baseline": _round(avg_quality_baseline, 4),
+            "swarm": _round(avg_quality_swarm, 4),
         },
         "avg_constraint_adherence": {
-            "baseline": round(avg_constraint_baseline, 4) if avg_constraint_baseline is not None else None,
-            "swarm": round(avg_constraint_swarm, 4) if avg_constraint_swarm is not None else None,
+            "baseline": _round(avg_constraint_baseline, 4),
+            "swarm": _round(avg_constraint_swarm, 4),
         },
-        "runs_with_quality_scores": len(pairs_q),
-        "runs_with_constraint_scores": len(pairs_c),
+        "runs_with_quality_scores": len(diffs_q),
+        "runs_with_constraint_scores": len(diffs_c),
         "wall_time_seconds": {
-            "p50": round(p50_wall, 4) if p50_wall is not None else None,
-            "p95": round(p95_wall, 4) if p95_wall is not None else None,
+            "p50": _round(p50_wall, 4),
+            "p95": _round(p95_wall, 4),
         },
         "coordination_overhead": coordination_overhead if coordination_overhead else None,
-        "vpd_asr": round(vpd_asr, 4) if vpd_asr is not None else None,
+        "vpd_asr": _round(vpd_asr, 4),
         "notable_failures": notable_failures,
     }
     return summary
@@ -203,8 +245,7 @@ def main():
     runs = load_runs()
     summary = aggregate(runs)
     os.makedirs(RESULTS_DIR, exist_ok=True)
-    with open(SUMMARY_V1_PATH, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    dump_path(SUMMARY_V1_PATH, summary)
     print(f"Wrote {SUMMARY_V1_PATH} (task_count={summary['task_count']})")
 
 
@@ -4,7 +4,6 @@ Run tasks, show outputs, record human evaluation, display logged results.
 No dashboards, charts, auth, or automation.
 """
 
-import json
 import os
 import time
 import uuid
@@ -12,20 +11,21 @@ from typing import Optional, Tuple
 
 import streamlit as st
 
+from jsonio import loads
 from run_logging import FailureReason, RUNS_PATH, log_event, write_run_summary
-from metrics import load_summaries, success_rate, tokens_per_success, cost_per_success
+from metrics import compute_all_metrics, group_by_arm
 from pipeline import SWARM_ROLES, cost_usd, run_baseline, run_swarm
 
-TASK_BUCKETS = [
+TASK_BUCKETS = (
     "single-step",
     "multi-step",
     "tool-heavy",
     "high-ambiguity",
     "verification-heavy",
     "creative-but-constrained",
-]
+)
 
-FAILURE_REASONS = [e.value for e in FailureReason]
+FAILURE_REASONS = tuple(e.value for e in FailureReason)
 
 
 def avg_quality(summaries, arm):
@@ -34,6 +34,59 @@ def avg_quality(summaries, arm):
     return sum(vals) / len(vals) if vals else None
 
 
+# Cached on (path, mtime): Streamlit reruns the script on every widget change, but
+# runs.jsonl only changes on "Finalize Run", so reparse/reaggregate only when it does.
+
+@st.cache_data(show_spinner=False)
+def _load_rows(path: str, mtime: float) -> list:
+    """Parse runs.jsonl (one binary read + per-line parse)."""
+    with open(path, "rb") as f:
+        return [loads(line) for line in f.read().splitlines() if line.strip()]
+
+
+@st.cache_data(show_spinner=False)
+def _results_table(path: str, mtime: float) -> list:
+    table_data = []
+    for s in _load_rows(path, mtime):
+        o = s.get("outcome", {})
+        u = s.get("usage", {})
+        c = s.get("cost_usd", {})
+        sc = s.get("scores", {})
+        table_data.append({
+            "run_id": s.get("run_id", ""),
+            "task_bucket": s.get("task_bucket", ""),
+            "arm": s.get("arm", ""),
+            "outcome.success": o.get("success"),
+            "scores.quality": sc.get("quality"),
+            "usage.tokens_in": u.get("tokens_in"),
+            "cost_usd.total": c.get("total"),
+            "outcome.failure_reason": o.get("failure_reason"),
+        })
+    return table_data
+
+
+@st.cache_data(show_spinner=False)
+def _compute_agg(path: str, mtime: float) -> list:
+    summaries = _load_rows(path, mtime)
+    if not summaries:
+        return []
+    by_arm = group_by_arm(summaries)
+    agg = []
+    for arm in ["monolith", "swarm"]:
+        rows = by_arm.get(arm, [])
+        m = compute_all_metrics(summaries=rows)
+        sr, tps, cps = m["success_rate"], m["tokens_per_success"], m["cost_per_success"]
+        aq = avg_quality(rows, arm)
+        agg.append({
+            "arm": arm,
+            "Success Rate": f"{sr:.2%}" if sr is not None else "—",
+            "Avg Quality": f"{aq:.2f}" if aq is not None else "—",
+            "Tokens per Success": f"{tps:.0f}" if tps else "—",
+            "Cost per Success": f"${cps:.6f}" if cps else "—",
+        })
+    return agg
+
+
 # ---------------------------------------------------------------------------
 # UI
 # ---------------------------------------------------------------------------
@@ -63,10 +116,20 @@ if run_clicked:
                 monolith_out, mi_in, mi_out = run_baseline(task, run_id, task_id, bucket)
                 monolith_time = time.perf_counter() - t0
         with col2:
+            # The Editor's answer streams into this placeholder while the swarm finishes; it is cleared
+            # once run_swarm returns.
+            live = st.empty()
+            streamed = []
+
+            def show_delta(text):
+                streamed.append(text)
+                live.markdown("".join(streamed))
+
             with st.spinner("Swarm..."):
                 t0 = time.perf_counter()
-                swarm_out, si_in, si_out = run_swarm(task, run_id, task_id, bucket)
+                swarm_out, si_in, si_out = run_swarm(task, run_id, task_id, bucket, on_final_delta=show_delta)
                 swarm_time = time.perf_counter() - t0
+            live.empty()  # the finished answer is shown in "2) Output Comparison"
 
         st.session_state["last_run"] = {
             "run_id": run_id,
@@ -174,6 +237,10 @@ if st.session_state.get("last_run"):
                 duplicate_work=duplicate_swarm,
                 path=RUNS_PATH,
             )
+            # mtime keys the caches, but clear explicitly in case of coarse mtime resolution.
+            _load_rows.clear()
+            _results_table.clear()
+            _compute_agg.clear()
             st.success("Run written to runs.jsonl.")
 else:
     st.caption("Run an experiment to evaluate.")
@@ -181,31 +248,10 @@ else:
 # 4) Results Table Section
 st.header("4) Results Table")
 runs_path = RUNS_PATH
-if os.path.isfile(runs_path):
-    rows = []
-    with open(runs_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            rows.append(json.loads(line))
-    if rows:
-        table_data = []
-        for s in rows:
-            o = s.get("outcome", {})
-            u = s.get("usage", {})
-            c = s.get("cost_usd", {})
-            sc = s.get("scores", {})
-            table_data.append({
-                "run_id": s.get("run_id", ""),
-                "task_bucket": s.get("task_bucket", ""),
-                "arm": s.get("arm", ""),
-                "outcome.success": o.get("success"),
-                "scores.quality": sc.get("quality"),
-                "usage.tokens_in": u.get("tokens_in"),
-                "cost_usd.total": c.get("total"),
-                "outcome.failure_reason": o.get("failure_reason"),
-            })
+runs_mtime = os.path.getmtime(runs_path) if os.path.isfile(runs_path) else None
+if runs_mtime is not None:
+    table_data = _results_table(runs_path, runs_mtime)
+    if table_data:
         st.dataframe(table_data, use_container_width=True, hide_index=True)
     else:
         st.caption("No runs yet.")
@@ -214,22 +260,8 @@ else:
 
 # 5) Aggregate Summary Section
 st.header("5) Aggregate Summary")
-summaries = load_summaries(runs_path)
-if summaries:
-    arms = ["monolith", "swarm"]
-    agg = []
-    for arm in arms:
-        sr = success_rate(summaries=summaries, arm=arm)
-        aq = avg_quality(summaries, arm)
-        tps = tokens_per_success(summaries=summaries, arm=arm)
-        cps = cost_per_success(summaries=summaries, arm=arm)
-        agg.append({
-            "arm": arm,
-            "Success Rate": f"{sr:.2%}" if sr is not None else "—",
-            "Avg Quality": f"{aq:.2f}" if aq is not None else "—",
-            "Tokens per Success": f"{tps:.0f}" if tps else "—",
-            "Cost per Success": f"${cps:.6f}" if cps else "—",
-        })
+agg = _compute_agg(runs_path, runs_mtime) if runs_mtime is not None else []
+if agg:
     st.dataframe(agg, use_container_width=True, hide_index=True)
 else:
     st.caption("No data. Finalize runs to see aggregates.")
@@ -1,16 +1,18 @@
 """
 Batch runner: run baseline and swarm for each benchmark task, write results to runs/{task_id}.json.
-Uses shared pipeline (no Streamlit/UI dependencies). No retries, no parallelization.
+Uses shared pipeline (no Streamlit/UI dependencies). No retries. Tasks run one at a time unless
+--workers / SWARM_WORKERS > 1; arms run one after the other unless SWARM_PARALLEL_ARMS=1.
 
 Event-level logging: log_event is passed to run_baseline/run_swarm so every phase transition
 is written to logs/events.jsonl (Instrumentation Appendix v0.1).
 """
 
-import json
 import os
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from jsonio import dump_path, load_path
 from pipeline import SWARM_ROLES, cost_usd, run_baseline, run_swarm
 from run_logging import EVENTS_PATH, FailureReason, RUNS_PATH, log_event, write_run_summary
 
@@ -18,12 +20,35 @@ _BASE = os.path.dirname(__file__)
 TASKS_V1_PATH = os.path.join(_BASE, "tasks_v1.json")
 BENCHMARK_PATH = os.path.join(_BASE, "benchmark_v1.json")
 RUNS_DIR = os.path.join(_BASE, "runs")
+# Opt-in: run the two arms of a task concurrently (wall time ≈ max of the arms instead of the sum).
+# Off by default so per-arm timings match the sequential v1 runs.
+PARALLEL_ARMS = os.environ.get("SWARM_PARALLEL_ARMS", "0") == "1"
+# Tasks in flight at once. Each swarm task makes ~6 sequential Groq calls, so size this against
+# your Groq requests-per-minute limit (roughly RPM / (7 * calls-per-minute-per-task)); 1 = serial.
+WORKERS = int(os.environ.get("SWARM_WORKERS", "1"))
 
 
 def load_benchmark(path=None):
     path = path or (TASKS_V1_PATH if os.path.isfile(TASKS_V1_PATH) else BENCHMARK_PATH)
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return load_path(path)
+
+
+def _run_arm(run_arm, prompt, run_id, task_id, task_bucket, usage):
+    """Run one arm; return (output, tokens_in, tokens_out, error_type, seconds). Fills usage (cached tokens)."""
+    t0 = time.perf_counter()
+    try:
+        output, tokens_in, tokens_out = run_arm(prompt, run_id, task_id, task_bucket, log_event=log_event, usage=usage)
+        error_type = None
+    except Exception as e:
+        output, tokens_in, tokens_out, error_type = None, 0, 0, type(e).__name__
+    return output, tokens_in, tokens_out, error_type, time.perf_counter() - t0
+
+
+def _cache_hit(usage):
+    """True if every call of the arm was replayed (SWARM_MEMO / SWARM_LLM_CACHE); None when both are off."""
+    if "llm_cache_hits" not in usage:
+        return None
+    return usage["llm_cache_hits"] == usage["calls"]
 
 
 def run_task(task):
@@ -37,37 +62,31 @@ def run_task(task):
     prompt = task["prompt"]
     run_id = str(uuid.uuid4())
 
-    baseline_output = None
-    swarm_output = None
-    baseline_tokens_in = baseline_tokens_out = 0
-    swarm_tokens_in = swarm_tokens_out = 0
-    baseline_error_type = None
-    swarm_error_type = None
+    args = (prompt, run_id, task_id, task_bucket)
+    baseline_usage, swarm_usage = {}, {}
     t0 = time.perf_counter()
 
-    try:
-        baseline_output, baseline_tokens_in, baseline_tokens_out = run_baseline(
-            prompt, run_id, task_id, task_bucket, log_event=log_event
+    if PARALLEL_ARMS:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            swarm_future = pool.submit(_run_arm, run_swarm, *args, swarm_usage)
+            baseline_output, baseline_tokens_in, baseline_tokens_out, baseline_error_type, baseline_time = _run_arm(
+                run_baseline, *args, baseline_usage
+            )
+            swarm_output, swarm_tokens_in, swarm_tokens_out, swarm_error_type, swarm_time = swarm_future.result()
+        swarm_attempted = True
+    else:
+        baseline_output, baseline_tokens_in, baseline_tokens_out, baseline_error_type, baseline_time = _run_arm(
+            run_baseline, *args, baseline_usage
         )
-    except Exception as e:
-        baseline_error_type = type(e).__name__
-        baseline_output = None
-
-    t1 = time.perf_counter()
-
-    if baseline_error_type is None:
-        try:
-            swarm_output, swarm_tokens_in, swarm_tokens_out = run_swarm(
-                prompt, run_id, task_id, task_bucket, log_event=log_event
+        swarm_attempted = baseline_error_type is None
+        if swarm_attempted:
+            swarm_output, swarm_tokens_in, swarm_tokens_out, swarm_error_type, swarm_time = _run_arm(
+                run_swarm, *args, swarm_usage
             )
-        except Exception as e:
-            swarm_error_type = type(e).__name__
-            swarm_output = None
-
-    t2 = time.perf_counter()
-    baseline_time = t1 - t0
-    swarm_time = t2 - t1
-    wall_time_seconds = t2 - t0
+        else:
+            swarm_output, swarm_tokens_in, swarm_tokens_out, swarm_error_type, swarm_time = None, 0, 0, None, 0.0
+
+    wall_time_seconds = time.perf_counter() - t0
     baseline_tokens_used = baseline_tokens_in + baseline_tokens_out
     swarm_tokens_used = swarm_tokens_in + swarm_tokens_out
     tokens_used = baseline_tokens_used + swarm_tokens_used
@@ -90,7 +109,7 @@ def run_task(task):
 
     failure_reason_baseline = map_error(baseline_error_type)
     # If swarm was never attempted (baseline failed), fall back to baseline error for swarm arm
-    failure_reason_swarm = map_error(swarm_error_type or baseline_error_type)
+    failure_reason_swarm = map_error(swarm_error_type if swarm_attempted else baseline_error_type)
 
     # Overall success flag kept for backward compatibility (used in runs/{task_id}.json)
     success = baseline_success and swarm_success
@@ -110,8 +129,10 @@ def run_task(task):
         tokens_in=baseline_tokens_in,
         tokens_out=baseline_tokens_out,
         cost_usd=cost_baseline,
-        retry_count=0,
+        retry_count=baseline_usage.get("retries", 0),
         wall_seconds=baseline_time,
+        tokens_in_cached=baseline_usage.get("cached_tokens_in", 0),
+        cache_hit=_cache_hit(baseline_usage),
         path=RUNS_PATH,
     )
     write_run_summary(
@@ -126,8 +147,12 @@ def run_task(task):
         tokens_in=swarm_tokens_in,
         tokens_out=swarm_tokens_out,
         cost_usd=cost_swarm,
-        retry_count=0,
+        retry_count=swarm_usage.get("retries", 0),
         wall_seconds=swarm_time,
+        tokens_in_cached=swarm_usage.get("cached_tokens_in", 0),
+        cache_hit=_cache_hit(swarm_usage),
+        early_exit=swarm_usage.get("early_exit"),
+        speculative_hit=swarm_usage.get("speculative_hit"),
         path=RUNS_PATH,
     )
 
@@ -153,21 +178,41 @@ def run_task(task):
     }
 
 
-def main(benchmark_path=None):
+def run_and_write(task):
+    """Run one task and write runs/{task_id}.json; return (out_path, result)."""
+    out_path = os.path.join(RUNS_DIR, f"{task['id']}.json")
+    result = run_task(task)
+    dump_path(out_path, result)
+    return out_path, result
+
+
+def _report(out_path, result):
+    print(f"Wrote {out_path} (success={result['metrics']['success']})")
+
+
+def main(benchmark_path=None, workers=None):
     os.makedirs(RUNS_DIR, exist_ok=True)
     # Ensure logs/ exists so event logging (log_event) writes to logs/events.jsonl
     os.makedirs(os.path.dirname(EVENTS_PATH), exist_ok=True)
     data = load_benchmark(benchmark_path)
     tasks = data.get("tasks", [])
+    workers = max(1, workers or WORKERS)
 
-    for task in tasks:
-        task_id = task["id"]
-        out_path = os.path.join(RUNS_DIR, f"{task_id}.json")
-        result = run_task(task)
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"Wrote {out_path} (success={result['metrics']['success']})")
+    if workers == 1:
+        for task in tasks:
+            _report(*run_and_write(task))
+        return
+    # Each task writes its own file as soon as it finishes; report in completion order.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task") as pool:
+        for future in as_completed([pool.submit(run_and_write, task) for task in tasks]):
+            _report(*future.result())
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    p = argparse.ArgumentParser(description="Run baseline and swarm for each benchmark task.")
+    p.add_argument("--benchmark", default=None, help="Benchmark JSON (default: tasks_v1.json or benchmark_v1.json).")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Tasks to run concurrently (default: SWARM_WORKERS or 1). Keep within your Groq RPM limit.")
+    args = p.parse_args()
+    main(args.benchmark, workers=args.workers)
@@ -9,25 +9,52 @@ Canonical Bintly identity, constraints, and voice: bintly_system_prompt.txt.
 import json
 import os
 import re
+import threading
 import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from jsonio import dump_path, dumps, load_path, loads
+
+try:
+    import build_moltbook_post
+except Exception:  # post builder unavailable: fall back to the prebuilt post files
+    build_moltbook_post = None
+
 _BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LAUNCH_POST_PATH = os.path.join(_BASE_DIR, "moltbook_launch_post.txt")
 BINTLY_SYSTEM_PROMPT_PATH = os.path.join(_BASE_DIR, "bintly_system_prompt.txt")
 STATE_PATH = os.path.join(_BASE_DIR, ".bintly_orchestrator_state.json")
+# Comment IDs already replied to, one per line (append-only; grows by one line per reply).
+REPLIED_LOG_PATH = os.path.join(_BASE_DIR, ".bintly_replied.log")
 ERROR_LOG_PATH = os.path.join(_BASE_DIR, "logs", "bintly_errors.log")
 
 
+# Error lines buffered during a run; run() appends them to ERROR_LOG_PATH in one write at the end.
+_ERROR_LINES: list[str] = []
+_ERROR_LINES_LOCK = threading.Lock()
+
+
 def _log_error(msg: str) -> None:
-    """Append a timestamped error line to the error log file."""
+    """Buffer a timestamped error line for the error log file (written by _flush_error_log)."""
+    ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with _ERROR_LINES_LOCK:
+        _ERROR_LINES.append(f"{ts} {msg}\n")
+
+
+def _flush_error_log() -> None:
+    """Append all buffered error lines to the error log file with a single open/write."""
+    with _ERROR_LINES_LOCK:
+        lines = "".join(_ERROR_LINES)
+        _ERROR_LINES.clear()
+    if not lines:
+        return
     try:
         os.makedirs(os.path.dirname(ERROR_LOG_PATH), exist_ok=True)
-        ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
         with open(ERROR_LOG_PATH, "a", encoding="utf-8") as f:
-            f.write(f"{ts} {msg}\n")
+            f.write(lines)
     except OSError:
         pass
 
@@ -49,6 +76,7 @@ def get_bintly_auth_header() -> dict[str, str] | None:
 MAX_POSTS_PER_RUN = 1
 MAX_REPLIES_PER_POST = 3
 MAX_TOKENS_PER_REPLY = 150  # approximate; we cap by character budget
+MAX_COMMENT_FETCH_WORKERS = 8  # concurrent get_comments requests across posts
 
 # Approximate chars per token for reply truncation
 CHARS_PER_TOKEN = 4
@@ -120,24 +148,29 @@ class MoltbookHTTPClient(BintlyClient):
 
     def _request(self, method: str, path: str, data: dict | None = None) -> dict | list:
         self.last_error = None
-        self._last_raw_response: str = ""
+        self._last_raw = b""
         url = f"{self.base_url}/{path.lstrip('/')}"
         headers = {"Content-Type": "application/json", **self.auth_header}
-        body = json.dumps(data).encode("utf-8") if data else None
+        body = dumps(data) if data else None
         req = urllib.request.Request(url, data=body, headers=headers, method=method)
         try:
             with urllib.request.urlopen(req, timeout=30) as resp:
-                raw = resp.read().decode("utf-8", errors="replace")
-                self._last_raw_response = raw
-                return json.loads(raw) if raw.strip() else {}
+                raw = resp.read()
+                self._last_raw = raw
+                return loads(raw) if raw.strip() else {}
         except urllib.error.HTTPError as e:
-            self._last_raw_response = e.read().decode("utf-8", errors="replace")
+            self._last_raw = e.read()
             self.last_error = f"HTTP {e.code} {e.reason}: {self._last_raw_response[:200]}"
             return {}
-        except (urllib.error.URLError, json.JSONDecodeError, OSError) as e:
+        except (urllib.error.URLError, ValueError, OSError) as e:  # ValueError: JSONDecodeError, bad UTF-8
             self.last_error = str(e)
             return {}
 
+    @property
+    def _last_raw_response(self) -> str:
+        """Body of the last response as text (decoded only when an error message needs it)."""
+        return getattr(self, "_last_raw", b"").decode("utf-8", errors="replace")
+
     def publish_post(self, content: str, submolt: str = "general", title: str | None = None) -> str | None:
         self.last_error = None
         self.last_post_response = None
@@ -207,15 +240,35 @@ class MoltbookHTTPClient(BintlyClient):
 
 def _load_state() -> dict:
     try:
-        with open(STATE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_path(STATE_PATH)
     except (FileNotFoundError, json.JSONDecodeError):
-        return {"posts_this_run": 0, "replies_by_post": {}, "replied_comment_ids": []}
+        return {"posts_this_run": 0, "replies_by_post": {}}
 
 
 def _save_state(state: dict) -> None:
-    with open(STATE_PATH, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+    dump_path(STATE_PATH, state)
+
+
+def _append_replied(comment_ids: list[str]) -> None:
+    if not comment_ids:
+        return
+    with open(REPLIED_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write("".join(f"{cid}\n" for cid in comment_ids))
+
+
+def _load_replied(state: dict) -> set[str]:
+    """Replied comment IDs (as str) from REPLIED_LOG_PATH.
+
+    Older state files kept the full list under replied_comment_ids; it is moved into the log
+    once and dropped from the state.
+    """
+    legacy = [str(cid) for cid in state.pop("replied_comment_ids", None) or []]
+    _append_replied(legacy)
+    try:
+        with open(REPLIED_LOG_PATH, "r", encoding="utf-8") as f:
+            return set(f.read().splitlines())
+    except FileNotFoundError:
+        return set()
 
 
 def _reset_run_state(state: dict) -> dict:
@@ -239,8 +292,7 @@ def get_canonical_launch_post() -> str:
     - Measured results and limits (when results/summary_v1.json exists)
     """
     try:
-        from build_moltbook_post import build_combined_post
-        content = build_combined_post(write_to_file=True)
+        content = build_moltbook_post.build_combined_post(write_to_file=True)
         if content:
             return content
     except Exception:
@@ -260,8 +312,7 @@ def get_canonical_launch_post() -> str:
 def get_launch_post_title() -> str:
     """Return the title used when publishing the launch post to Moltbook."""
     try:
-        from build_moltbook_post import get_launch_post_title as _get
-        return _get()
+        return build_moltbook_post.get_launch_post_title()
     except Exception:
         pass
     return "Swarm Versonalities v1 — a role-based thinking protocol for agents"
@@ -270,8 +321,7 @@ def get_launch_post_title() -> str:
 def get_results_post() -> str:
     """Return Phase 4.2 results post: deltas, cost, coordination overhead, limits of findings."""
     try:
-        from build_moltbook_post import build_results_post
-        return build_results_post(write_to_file=True) or ""
+        return build_moltbook_post.build_results_post(write_to_file=True) or ""
     except Exception:
         pass
     path = os.path.join(_BASE_DIR, "moltbook_results_post.txt")
@@ -319,6 +369,11 @@ _TEST_RESULTS_KEYWORDS = [
     "we ran", "our run", "our summary", "test results", "our metrics",
 ]
 
+# One alternation per class, compiled once. Plain substring semantics (no word boundaries), matched
+# against the lowercased text like the keyword lists above.
+_METHODOLOGY_RE = re.compile("|".join(map(re.escape, _METHODOLOGY_KEYWORDS)))
+_TEST_RESULTS_RE = re.compile("|".join(map(re.escape, _TEST_RESULTS_KEYWORDS)))
+
 
 def classify_comment(body: str) -> str:
     """
@@ -332,13 +387,11 @@ def classify_comment(body: str) -> str:
     if _IGNORE_RE and _IGNORE_RE.search(text):
         return "ignore"
 
-    for k in _METHODOLOGY_KEYWORDS:
-        if k in text:
-            return "methodology_question"
+    if _METHODOLOGY_RE.search(text):
+        return "methodology_question"
 
-    for k in _TEST_RESULTS_KEYWORDS:
-        if k in text:
-            return "test_results_report"
+    if _TEST_RESULTS_RE.search(text):
+        return "test_results_report"
 
     return "ignore"
 
@@ -351,7 +404,9 @@ def _truncate_to_token_budget(text: str, max_tokens: int = MAX_TOKENS_PER_REPLY)
     max_chars = max_tokens * CHARS_PER_TOKEN
     if len(text) <= max_chars:
         return text
-    return text[: max_chars - 3].rsplit(" ", 1)[0] + "..." if " " in text else text[: max_chars - 3] + "..."
+    # Cut at the last space inside the budget (no split list / extra slice); hard cut if there is none.
+    cut = text.rfind(" ", 0, max_chars - 3)
+    return (text[:cut] if cut >= 0 else text[: max_chars - 3]) + "..."
 
 
 def get_reply_for_comment(comment_class: str) -> str:
@@ -381,6 +436,13 @@ def run(
     Does not run tasks, modify benchmarks, or generate new claims.
     Returns a small summary dict: posted, replies_posted, errors.
     """
+    try:
+        return _run(client, publish_post=publish_post, poll_comments=poll_comments)
+    finally:
+        _flush_error_log()
+
+
+def _run(client: BintlyClient | None, *, publish_post: bool, poll_comments: bool) -> dict:
     client = client or BintlyClient()
     state = _load_state()
     _reset_run_state(state)
@@ -418,35 +480,50 @@ def run(
     if not poll_comments:
         return summary
 
-    try:
-        posts = client.list_my_posts()
-    except Exception as e:
-        _record_error(summary, f"list_posts: {e}")
-        return summary
-
-    replied = set(state.get("replied_comment_ids", []))
     replies_by_post = state.get("replies_by_post", {})
 
-    for post in posts:
-        post_id = post.get("id") or post.get("post_id")
-        if not post_id:
-            continue
-        reply_count = replies_by_post.get(post_id, 0)
-        if reply_count >= MAX_REPLIES_PER_POST:
-            continue
+    # List posts and, at the same time, prefetch comments for the posts seen last run; only posts
+    # that are new in this listing need a fetch after it returns. All fetches are read-only.
+    known_ids = [pid for pid in state.get("post_ids", []) if replies_by_post.get(pid, 0) < MAX_REPLIES_PER_POST]
+    with ThreadPoolExecutor(max_workers=MAX_COMMENT_FETCH_WORKERS) as pool:
+        posts_future = pool.submit(client.list_my_posts)
+        prefetched = {post_id: pool.submit(client.get_comments, post_id) for post_id in known_ids}
+        try:
+            posts = posts_future.result()
+        except Exception as e:
+            _record_error(summary, f"list_posts: {e}")
+            return summary
+
+        listed_ids = []
+        post_ids = []
+        for post in posts:
+            post_id = post.get("id") or post.get("post_id")
+            if not post_id:
+                continue
+            listed_ids.append(post_id)
+            if replies_by_post.get(post_id, 0) < MAX_REPLIES_PER_POST:
+                post_ids.append(post_id)
+        comment_futures = [prefetched.get(post_id) or pool.submit(client.get_comments, post_id) for post_id in post_ids]
 
+    replied = _load_replied(state)
+    state["post_ids"] = listed_ids
+
+    for post_id, future in zip(post_ids, comment_futures):
+        reply_count = replies_by_post.get(post_id, 0)
         try:
-            comments = client.get_comments(post_id)
+            comments = future.result()
         except Exception as e:
             _record_error(summary, f"get_comments({post_id}): {e}")
             continue
 
+        # Replies are posted one at a time, in comment order: they are writes to an external API.
+        posted = []
         for comment in comments:
             if reply_count >= MAX_REPLIES_PER_POST:
                 break
             cid = comment.get("id") or comment.get("comment_id")
             body = comment.get("body") or comment.get("text") or ""
-            if not cid or cid in replied:
+            if not cid or str(cid) in replied or str(cid) in posted:
                 continue
 
             kind = classify_comment(body)
@@ -459,15 +536,17 @@ def run(
 
             try:
                 rid = client.post_reply(post_id, str(cid), reply_text)
-                if rid:
-                    replied.add(cid)
-                    reply_count += 1
-                    replies_by_post[post_id] = reply_count
-                    summary["replies_posted"] += 1
             except Exception as e:
                 _record_error(summary, f"reply({cid}): {e}")
+                continue
+            if rid:
+                posted.append(str(cid))
+                reply_count += 1
+                replies_by_post[post_id] = reply_count
+                summary["replies_posted"] += 1
+        replied.update(posted)
+        _append_replied(posted)
 
-    state["replied_comment_ids"] = list(replied)
     state["replies_by_post"] = replies_by_post
     _save_state(state)
 
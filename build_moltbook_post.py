@@ -7,8 +7,12 @@ Build Moltbook posts per SYSTEM EXECUTION SEQUENCE Phase 4.
 Reads: results/summary_v1.json, results/internal_evaluation.json. Does not run tasks or modify benchmarks.
 """
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+
+from jsonio import load_path
 
 _BASE = os.path.dirname(os.path.abspath(__file__))
 RESULTS_DIR = os.path.join(_BASE, "results")
@@ -18,112 +22,147 @@ OUTPUT_LAUNCH = os.path.join(_BASE, "moltbook_launch_post.txt")
 OUTPUT_RESULTS = os.path.join(_BASE, "moltbook_results_post.txt")
 OUTPUT_COMBINED = os.path.join(_BASE, "moltbook_combined_post.txt")
 
+_EMPTY: dict = {}  # shared default for missing sections; never mutate
+_task_id = itemgetter("task_id")
 
-def _load_summary() -> dict | None:
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    """(mtime_ns, size) of path, or None if it cannot be stat'ed. Cache key for everything derived from the file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=4)
+def _load_json(path: str, stamp: tuple[int, int] | None) -> dict | None:
+    """Parsed JSON file, re-read only when its stamp changes (shared by all builders; do not mutate)."""
+    if stamp is None:
+        return None
     try:
-        with open(SUMMARY_V1_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return load_path(path)
+    except (OSError, ValueError):  # ValueError covers JSONDecodeError from json and orjson
         return None
 
 
+def _load_summary() -> dict | None:
+    return _load_json(SUMMARY_V1_PATH, _stamp(SUMMARY_V1_PATH))
+
+
 def _get_baseline_findings_text() -> str | None:
     """Load internal evaluation artifact and return a short findings block for the launch post."""
-    try:
-        with open(ARTIFACT_JSON_PATH, "r", encoding="utf-8") as f:
-            art = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+    return _findings_text(_stamp(ARTIFACT_JSON_PATH))
+
+
+@lru_cache(maxsize=1)
+def _findings_text(stamp: tuple[int, int] | None) -> str | None:
+    art = _load_json(ARTIFACT_JSON_PATH, stamp)
+    if art is None:
         return None
     lines = []
-    deltas = art.get("deltas") or {}
+    deltas = art.get("deltas") or _EMPTY
     if deltas.get("token_cost_delta") is not None:
-        lines.append("• Token delta (swarm − baseline): " + str(deltas["token_cost_delta"]))
+        lines.append(f"• Token delta (swarm − baseline): {deltas['token_cost_delta']}")
     if deltas.get("quality_delta") is not None:
-        lines.append("• Quality delta: " + str(deltas["quality_delta"]))
-    trade = art.get("cost_efficiency_tradeoff") or {}
-    if trade.get("swarm_uses_more_tokens"):
+        lines.append(f"• Quality delta: {deltas['quality_delta']}")
+    if (art.get("cost_efficiency_tradeoff") or _EMPTY).get("swarm_uses_more_tokens"):
         lines.append("• Cost/efficiency: Swarm uses more tokens; tradeoff depends on quality and task type.")
-    helped = art.get("where_versonalities_helped") or []
-    hurt = art.get("where_versonalities_hurt") or []
+    helped = art.get("where_versonalities_helped")
+    hurt = art.get("where_versonalities_hurt")
     if helped:
-        lines.append("• Tasks where versonalities helped: " + ", ".join(x["task_id"] for x in helped[:5]))
+        lines.append(f"• Tasks where versonalities helped: {', '.join(map(_task_id, helped[:5]))}")
     if hurt:
-        lines.append("• Tasks where versonalities hurt: " + ", ".join(x["task_id"] for x in hurt[:5]))
+        lines.append(f"• Tasks where versonalities hurt: {', '.join(map(_task_id, hurt[:5]))}")
     lines.append("(Full metrics in results/summary_v1.json. No claim of general superiority.)")
     return "\n".join(lines)
 
 
+# Failure entries are normally a list of task IDs; anything else (e.g. a count or note) is printed as is.
+_TASK_LIST_TYPES = frozenset((list, tuple))
+
+# Dict-valued sections of summary_v1.json read by _format_results_for_post, in unpacking order.
+_SUMMARY_SECTIONS = (
+    "baseline_metrics",
+    "swarm_metrics",
+    "deltas",
+    "avg_quality",
+    "avg_constraint_adherence",
+    "wall_time_seconds",
+    "coordination_overhead",
+    "notable_failures",
+)
+
+
 def _format_results_for_post(summary: dict) -> str:
     """Format benchmark summary as human-readable text (no raw JSON)."""
-    b = summary.get("baseline_metrics") or {}
-    s = summary.get("swarm_metrics") or {}
-    d = summary.get("deltas") or {}
-    aq = summary.get("avg_quality") or {}
-    ac = summary.get("avg_constraint_adherence") or {}
-    wt = summary.get("wall_time_seconds") or {}
-    overhead = summary.get("coordination_overhead") or {}
-    failures = summary.get("notable_failures") or {}
+    b, s, d, aq, ac, wt, overhead, failures = (summary.get(key) or _EMPTY for key in _SUMMARY_SECTIONS)
 
     version = summary.get("benchmark_version", "sv-v1")
     n = summary.get("task_count", 0)
 
-    lines = [
-        f"This run used benchmark {version} with {n} tasks.",
-        "",
-        "Single agent (baseline)",
-        "• Success rate: " + _pct(b.get("success_rate")),
-        "• First-pass success: " + _pct(b.get("fps")),
-        "• Average tokens per task: " + _num(b.get("avg_tokens_used")),
-        "• Adjusted success rate (ASR): " + _pct(b.get("asr")),
-        "",
-        "Swarm (multi-role)",
-        "• Success rate: " + _pct(s.get("success_rate")),
-        "• First-pass success: " + _pct(s.get("fps")),
-        "• Average tokens per task: " + _num(s.get("avg_tokens_used")),
-        "• Adjusted success rate (ASR): " + _pct(s.get("asr")),
-        "",
-        "Comparison (swarm minus baseline)",
-        "• Quality delta: " + _num(d.get("quality_delta")) + " (positive = swarm scored higher on average)",
-        "• Constraint adherence delta: " + _num(d.get("constraint_adherence_delta")) + " (positive = swarm followed rules better)",
-        "• Extra tokens per task (swarm): " + _num(d.get("token_cost_delta")),
-        "",
-        "Average quality (0–5 scale, 5 = excellent): baseline " + _num(aq.get("baseline")) + ", swarm " + _num(aq.get("swarm")) + ".",
-        "Average constraint adherence (0–1, 1 = fully followed): baseline " + _num(ac.get("baseline")) + ", swarm " + _num(ac.get("swarm")) + ".",
-        "Runs with quality scores: " + str(summary.get("runs_with_quality_scores", 0)) + "; with constraint scores: " + str(summary.get("runs_with_constraint_scores", 0)) + ".",
-        "",
-        "Wall time: typical run " + _num(wt.get("p50")) + " s, 95th percentile " + _num(wt.get("p95")) + " s.",
-        "Coordination overhead: " + _num(overhead.get("token_delta")) + " extra tokens (swarm vs baseline).",
-        "Versonality performance delta (VPD): swarm ASR minus baseline ASR = " + _num(summary.get("vpd_asr")) + " (positive = swarm better on adjusted success).",
-    ]
-
     if failures:
-        lines.append("")
-        lines.append("Notable failures:")
-        for err_type, task_list in failures.items():
-            tasks_str = ", ".join(task_list) if isinstance(task_list, list) else str(task_list)
-            lines.append("• " + str(err_type) + ": " + tasks_str)
+        bullets = "\n".join(
+            f"• {err_type}: {', '.join(tasks) if type(tasks) in _TASK_LIST_TYPES else tasks}"
+            for err_type, tasks in failures.items()
+        )
+        failures_block = f"Notable failures:\n{bullets}"
     else:
-        lines.append("")
-        lines.append("Notable failures: none in this run.")
-
-    lines.extend([
-        "",
-        "What the terms mean",
-        "• Success rate (SR): how often the run completed without failing.",
-        "• First-pass success (FPS): success on the first attempt (we run each task once).",
-        "• Quality: 0–5 score for how good the output was (5 = excellent).",
-        "• Constraint adherence: 0–1 score for how well the output followed the rules (1 = fully followed).",
-        "• ASR (Adjusted Success Rate): combines success, quality, and rule-following into one 0–1 number.",
-        "• Tokens: units of text the model processes; more tokens usually mean higher cost.",
-        "• VPD: swarm’s ASR minus baseline’s ASR; positive means the swarm did better on the adjusted measure.",
-    ])
-    return "\n".join(lines)
+        failures_block = "Notable failures: none in this run."
+
+    return f"""This run used benchmark {version} with {n} tasks.
+
+Single agent (baseline)
+• Success rate: {_pct(b.get("success_rate"))}
+• First-pass success: {_pct(b.get("fps"))}
+• Average tokens per task: {_num(b.get("avg_tokens_used"))}
+• Adjusted success rate (ASR): {_pct(b.get("asr"))}
+
+Swarm (multi-role)
+• Success rate: {_pct(s.get("success_rate"))}
+• First-pass success: {_pct(s.get("fps"))}
+• Average tokens per task: {_num(s.get("avg_tokens_used"))}
+• Adjusted success rate (ASR): {_pct(s.get("asr"))}
+
+Comparison (swarm minus baseline)
+• Quality delta: {_num(d.get("quality_delta"))} (positive = swarm scored higher on average)
+• Constraint adherence delta: {_num(d.get("constraint_adherence_delta"))} (positive = swarm followed rules better)
+• Extra tokens per task (swarm): {_num(d.get("token_cost_delta"))}
+
+Average quality (0–5 scale, 5 = excellent): baseline {_num(aq.get("baseline"))}, swarm {_num(aq.get("swarm"))}.
+Average constraint adherence (0–1, 1 = fully followed): baseline {_num(ac.get("baseline"))}, swarm {_num(ac.get("swarm"))}.
+Runs with quality scores: {summary.get("runs_with_quality_scores", 0)}; with constraint scores: {summary.get("runs_with_constraint_scores", 0)}.
+
+Wall time: typical run {_num(wt.get("p50"))} s, 95th percentile {_num(wt.get("p95"))} s.
+Coordination overhead: {_num(overhead.get("token_delta"))} extra tokens (swarm vs baseline).
+Versonality performance delta (VPD): swarm ASR minus baseline ASR = {_num(summary.get("vpd_asr"))} (positive = swarm better on adjusted success).
+
+{failures_block}
+
+What the terms mean
+• Success rate (SR): how often the run completed without failing.
+• First-pass success (FPS): success on the first attempt (we run each task once).
+• Quality: 0–5 score for how good the output was (5 = excellent).
+• Constraint adherence: 0–1 score for how well the output followed the rules (1 = fully followed).
+• ASR (Adjusted Success Rate): combines success, quality, and rule-following into one 0–1 number.
+• Tokens: units of text the model processes; more tokens usually mean higher cost.
+• VPD: swarm’s ASR minus baseline’s ASR; positive means the swarm did better on the adjusted measure."""
+
+
+def _write_text(path: str, text: str) -> None:
+    """Write text as UTF-8 in one binary write (no text-layer buffering; newlines stay \\n)."""
+    with open(path, "wb") as f:
+        f.write(text.encode("utf-8"))
+
+
+# Values come from parsed JSON, so exact type checks cover every number (bool included, as isinstance did).
+_NUMBER_TYPES = frozenset((int, float, bool))
 
 
 def _pct(x) -> str:
     if x is None:
         return "—"
-    if isinstance(x, (int, float)):
+    if type(x) in _NUMBER_TYPES:
         return f"{float(x) * 100:.1f}%" if 0 <= x <= 1 else str(x)
     return str(x)
 
@@ -131,7 +170,7 @@ def _pct(x) -> str:
 def _num(x) -> str:
     if x is None:
         return "—"
-    if isinstance(x, float):
+    if type(x) is float:
         return f"{x:.2f}" if x != int(x) else f"{int(x)}"
     return str(x)
 
@@ -183,18 +222,12 @@ Artifact → Builder
 Always Critic → Builder → Editor
 Guardian if high-stakes or human-facing"""
 
-
-def build_launch_post(write_to_file: bool = True) -> str:
-    """Build launch post in the format that successfully creates a Moltbook post. Includes baseline findings when artifact exists."""
-    findings_block = _get_baseline_findings_text()
-    findings_section = ""
-    if findings_block:
-        findings_section = "\n\nOur baseline findings (one-time run of 12 tasks):\n" + findings_block + "\n\n"
-
-    post = f"""Swarm Versonalities v1 is a copy-paste prompt architecture that separates agent cognition into explicit execution roles (Planner, Researcher, Analyst, Builder, Critic, Editor, Guardian).
+# Launch post with everything but the findings filled in at import; __FINDINGS__ marks where they go.
+# Post templates carry no leading/trailing whitespace, so built posts need no .strip().
+_LAUNCH_TEMPLATE = """Swarm Versonalities v1 is a copy-paste prompt architecture that separates agent cognition into explicit execution roles (Planner, Researcher, Analyst, Builder, Critic, Editor, Guardian).
 
 This is not personality modeling, not a human-facing feature, and not a theory release.
-{findings_section}How to test:
+__FINDINGS__How to test:
 • Run a task using your normal approach (baseline)
 • Run the same task using Swarm Versonalities v1
 • Compare outcomes
@@ -210,12 +243,19 @@ When reporting results, please include:
 
 CANONICAL PROMPT (Swarm Versonalities v1)
 
-{CANONICAL_PROMPT_BLOCK}"""
+""" + CANONICAL_PROMPT_BLOCK
+
 
-    post = post.strip()
+def build_launch_post(write_to_file: bool = True) -> str:
+    """Build launch post in the format that successfully creates a Moltbook post. Includes baseline findings when artifact exists."""
+    findings_block = _get_baseline_findings_text()
+    findings_section = ""
+    if findings_block:
+        findings_section = f"\n\nOur baseline findings (one-time run of 12 tasks):\n{findings_block}\n\n"
+
+    post = _LAUNCH_TEMPLATE.replace("__FINDINGS__", findings_section)
     if write_to_file:
-        with open(OUTPUT_LAUNCH, "w", encoding="utf-8") as f:
-            f.write(post)
+        _write_text(OUTPUT_LAUNCH, post)
     return post
 
 
@@ -228,19 +268,28 @@ def get_launch_post_title() -> str:
 # Phase 4.2 — Results post (deltas, cost, coordination overhead, limits)
 # ---------------------------------------------------------------------------
 
-def build_results_post(write_to_file: bool = True) -> str:
-    """Measured deltas, cost + coordination overhead, explicit limits of findings."""
-    summary = _load_summary()
-    if not summary:
-        body = "No results yet. Run batch_runner.py then aggregate_results.py; results/summary_v1.json will be produced. This post will be updated when results exist."
-    else:
-        body = _format_results_for_post(summary)
+_NO_RESULTS_MSG = (
+    "No results yet. Run batch_runner.py then aggregate_results.py; results/summary_v1.json will be produced. "
+    "This post will be updated when results exist."
+)
 
-    post = f"""Swarm Versonalities v1 — Internal benchmark results (follow-up)
+_RESULTS_POST_HEADER = """Swarm Versonalities v1 — Internal benchmark results (follow-up)
 
 This post shares measured deltas, cost and coordination overhead, and the limits of these findings. No claim of general superiority.
 
----
+"""
+
+
+def _results_section() -> str:
+    """Measured results + limits, shared verbatim by the results and combined posts (rebuilt only when summary_v1.json changes)."""
+    return _results_text(_stamp(SUMMARY_V1_PATH))
+
+
+@lru_cache(maxsize=1)
+def _results_text(stamp: tuple[int, int] | None) -> str:
+    summary = _load_json(SUMMARY_V1_PATH, stamp)
+    body = _format_results_for_post(summary) if summary else _NO_RESULTS_MSG
+    return f"""---
 Measured results (from results/summary_v1.json)
 ---
 
@@ -254,17 +303,18 @@ Limits of these findings
 - Results are not proof of general superiority of either arm.
 - Single run per task; no retries. FPS equals SR in this run.
 - Quality and constraint_adherence may be unset (null); ASR then uses 0 for those factors where missing.
-- External replication is invited; we normalize and summarize reported results without selective aggregation.
-"""
+- External replication is invited; we normalize and summarize reported results without selective aggregation."""
+
 
-    post = post.strip()
+def build_results_post(write_to_file: bool = True) -> str:
+    """Measured deltas, cost + coordination overhead, explicit limits of findings."""
+    post = _RESULTS_POST_HEADER + _results_section()
     if write_to_file:
-        with open(OUTPUT_RESULTS, "w", encoding="utf-8") as f:
-            f.write(post)
+        _write_text(OUTPUT_RESULTS, post)
     return post
 
 
-def build_combined_post(write_to_file: bool = True) -> str:
+def build_combined_post(write_to_file: bool = True, *, launch: str | None = None) -> str:
     """
     Single post that includes:
     - What Swarm Versonalities v1 is and how to test (launch content)
@@ -272,45 +322,29 @@ def build_combined_post(write_to_file: bool = True) -> str:
     - Measured results and limits (results content)
 
     Intended for cases where Moltbook should have one post containing both
-    the prompt and the internal benchmark results.
+    the prompt and the internal benchmark results. Pass launch (from
+    build_launch_post) to reuse it instead of building it again.
     """
-    # Reuse launch content (without rewriting launch file)
-    launch = build_launch_post(write_to_file=False)
+    if launch is None:
+        # Reuse launch content (without rewriting launch file)
+        launch = build_launch_post(write_to_file=False)
 
-    summary = _load_summary()
-    if not summary:
-        body = "No results yet. Run batch_runner.py then aggregate_results.py; results/summary_v1.json will be produced. This post will be updated when results exist."
-    else:
-        body = _format_results_for_post(summary)
-
-    results_block = f"""---
-Measured results (from results/summary_v1.json)
----
-
-{body}
-
----
-Limits of these findings
----
-
-- Results are empirical and bounded by this benchmark and constraints.
-- Results are not proof of general superiority of either arm.
-- Single run per task; no retries. FPS equals SR in this run.
-- Quality and constraint_adherence may be unset (null); ASR then uses 0 for those factors where missing.
-- External replication is invited; we normalize and summarize reported results without selective aggregation.
-"""
-
-    combined = (launch + "\n\n" + results_block).strip()
+    combined = launch + "\n\n" + _results_section()
     if write_to_file:
-        with open(OUTPUT_COMBINED, "w", encoding="utf-8") as f:
-            f.write(combined)
+        _write_text(OUTPUT_COMBINED, combined)
     return combined
 
 
 def main():
-    build_launch_post(write_to_file=True)
-    build_results_post(write_to_file=True)
-    build_combined_post(write_to_file=True)
+    # Build all three posts in memory, then write the files concurrently.
+    launch = build_launch_post(write_to_file=False)
+    outputs = [
+        (OUTPUT_LAUNCH, launch),
+        (OUTPUT_RESULTS, build_results_post(write_to_file=False)),
+        (OUTPUT_COMBINED, build_combined_post(write_to_file=False, launch=launch)),
+    ]
+    with ThreadPoolExecutor(max_workers=len(outputs)) as pool:
+        list(pool.map(lambda item: _write_text(*item), outputs))
     print("Wrote", OUTPUT_LAUNCH, OUTPUT_RESULTS, OUTPUT_COMBINED)
 
 
@@ -9,23 +9,16 @@ Shows, in one place:
 - External reports count (if any)
 """
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
+import pandas as pd  # installed with streamlit
 import streamlit as st
 
-from metrics import (
-    average_quality,
-    cost_per_success,
-    load_summaries,
-    success_rate,
-    first_pass_success,
-    tokens_per_success,
-    tool_correctness,
-    policy_violation_rate,
-    critical_hallucination_rate,
-)
+from jsonio import load_path
+from metrics import compute_all_metrics, group_by_arm, load_summaries
+from run_logging import SUMMARIES_PATH
 
 
 _BASE = os.path.dirname(os.path.abspath(__file__))
@@ -43,28 +36,44 @@ BINTLY_STATE_PATH = os.path.join(_BASE, ".bintly_orchestrator_state.json")
 BINTLY_ERRORS_PATH = os.path.join(_BASE, "logs", "bintly_errors.log")
 
 
-def _load_json(path: str) -> Optional[Dict[str, Any]]:
+# Streamlit reruns this whole script on every interaction. File reads below are cached with
+# st.cache_data keyed on the file's (mtime_ns, size), so a rerun only re-parses files that changed.
+
+def _stamp(path: str) -> tuple:
+    """(mtime_ns, size) of path, or () if missing; part of the cache key for anything read from it."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        st_ = os.stat(path)
+    except OSError:
+        return ()
+    return st_.st_mtime_ns, st_.st_size
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        return load_path(path)
+    except (OSError, ValueError):  # ValueError covers JSONDecodeError from json and orjson
         return None
 
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def _load_json_at(path: str, stamp: tuple) -> Optional[Dict[str, Any]]:
+    return _read_json(path) if stamp else None
+
+
+def _load_json(path: str) -> Optional[Dict[str, Any]]:
+    return _load_json_at(path, _stamp(path))
+
+
+def _tasks_path() -> str:
+    return TASKS_V1_PATH if os.path.isfile(TASKS_V1_PATH) else BENCHMARK_PATH
+
+
 def _load_tasks() -> List[Dict[str, Any]]:
     """Load tasks from tasks_v1.json (or benchmark_v1.json as fallback)."""
-    path = TASKS_V1_PATH if os.path.isfile(TASKS_V1_PATH) else BENCHMARK_PATH
-    data = _load_json(path) or {}
+    data = _load_json(_tasks_path()) or {}
     return data.get("tasks", [])
 
 
-def _load_run_file(task_id: str) -> Optional[Dict[str, Any]]:
-    if not os.path.isdir(RUNS_DIR):
-        return None
-    path = os.path.join(RUNS_DIR, f"{task_id}.json")
-    return _load_json(path)
-
-
 def _load_summary_v1() -> Optional[Dict[str, Any]]:
     return _load_json(SUMMARY_V1_PATH)
 
@@ -73,23 +82,52 @@ def _load_artifact() -> Optional[Dict[str, Any]]:
     return _load_json(ARTIFACT_JSON_PATH)
 
 
-def _read_text(path: str, default: str = "") -> str:
+@st.cache_data(max_entries=16, show_spinner=False)
+def _read_text_at(path: str, stamp: tuple) -> Optional[str]:
     try:
         with open(path, "r", encoding="utf-8") as f:
             return f.read()
     except (FileNotFoundError, OSError):
-        return default
+        return None
+
+
+def _read_text(path: str, default: str = "") -> str:
+    text = _read_text_at(path, _stamp(path))
+    return default if text is None else text
 
 
 def _tail_file(path: str, max_lines: int = 50) -> List[str]:
+    return _tail_file_at(path, _stamp(path), max_lines)
+
+
+_TAIL_BLOCK = 8192
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _tail_file_at(path: str, stamp: tuple, max_lines: int) -> List[str]:
+    """Last max_lines lines of path, reading backwards in blocks so cost tracks the tail, not the file size."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-    except (FileNotFoundError, OSError):
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            buf = b""
+            # One newline more than needed guarantees the first kept line is complete.
+            while pos > 0 and buf.count(b"\n") <= max_lines:
+                step = min(_TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+    except OSError:
         return []
-    if len(lines) <= max_lines:
-        return [ln.rstrip("\n") for ln in lines]
-    return [ln.rstrip("\n") for ln in lines[-max_lines:]]
+    # Same line splitting as text-mode readlines (universal newlines).
+    lines = buf.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines[-max_lines:]
+
+
+def _first_set(value: Any, fallback: Any) -> Any:
+    """value unless it is None (a real 0 score must not fall through to fallback)."""
+    return fallback if value is None else value
 
 
 def _summaries_from_runs_dir() -> List[Dict[str, Any]]:
@@ -116,8 +154,8 @@ def _summaries_from_runs_dir() -> List[Dict[str, Any]]:
             "task_bucket": task_bucket,
             "outcome": {"success": base_ok, "failure_reason": None, "policy_violation": False, "hallucination_critical": False},
             "scores": {
-                "quality": m.get("baseline_quality_score") or m.get("quality_score"),
-                "constraint_adherence": m.get("baseline_constraint_adherence") or m.get("constraint_adherence"),
+                "quality": _first_set(m.get("baseline_quality_score"), m.get("quality_score")),
+                "constraint_adherence": _first_set(m.get("baseline_constraint_adherence"), m.get("constraint_adherence")),
             },
             "usage": {
                 "tokens_in": 0,
@@ -138,8 +176,8 @@ def _summaries_from_runs_dir() -> List[Dict[str, Any]]:
             "task_bucket": task_bucket,
             "outcome": {"success": swarm_ok, "failure_reason": None, "policy_violation": False, "hallucination_critical": False},
             "scores": {
-                "quality": m.get("swarm_quality_score") or m.get("quality_score"),
-                "constraint_adherence": m.get("swarm_constraint_adherence") or m.get("constraint_adherence"),
+                "quality": _first_set(m.get("swarm_quality_score"), m.get("quality_score")),
+                "constraint_adherence": _first_set(m.get("swarm_constraint_adherence"), m.get("constraint_adherence")),
             },
             "usage": {
                 "tokens_in": 0,
@@ -154,6 +192,88 @@ def _summaries_from_runs_dir() -> List[Dict[str, Any]]:
     return out
 
 
+# Column dtypes for the coverage table, given up front so st.dataframe's Arrow conversion does not
+# have to infer them (run_success is nullable: None when there is no run file).
+_COVERAGE_DTYPES = {
+    "task_id": "string",
+    "task_bucket": "category",
+    "has_run_file": "bool",
+    "run_success": "boolean",
+    "prompt": "string",
+}
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _coverage_table(tasks_path: str, tasks_stamp: tuple, runs_dir_stamp: tuple) -> pd.DataFrame:
+    """
+    One row per benchmark task with whether runs/{id}.json exists and its metrics.success.
+    Lists runs/ once and only opens files that exist, parsing them on a small thread pool.
+    Keyed like _arm_metrics_table, so reruns reuse the frame until tasks or runs change.
+    """
+    tasks = _load_tasks()
+    existing = set(os.listdir(RUNS_DIR)) if runs_dir_stamp else set()
+    ids = [t.get("id", "") for t in tasks]
+    found = [tid for tid in ids if f"{tid}.json" in existing]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        runs = dict(zip(found, pool.map(_read_json, [os.path.join(RUNS_DIR, f"{tid}.json") for tid in found])))
+    rows = []
+    for tid, t in zip(ids, tasks):
+        run = runs.get(tid)
+        rows.append(
+            (
+                tid,
+                t.get("task_bucket", ""),
+                run is not None,
+                (run.get("metrics") or {}).get("success") if run else None,
+                t.get("prompt", ""),
+            )
+        )
+    return pd.DataFrame.from_records(rows, columns=list(_COVERAGE_DTYPES)).astype(_COVERAGE_DTYPES)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _reports_frame(stamp: tuple) -> Optional[pd.DataFrame]:
+    """external_reports.json as a frame when it is a list of reports; None otherwise."""
+    reports = _load_json_at(EXTERNAL_REPORTS_PATH, stamp)
+    return pd.DataFrame(reports) if isinstance(reports, list) and reports else None
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _arm_metrics_table(summaries_stamp: tuple, runs_dir_stamp: tuple) -> tuple:
+    """
+    Per-arm metric rows for the run-summary panel, whether they came from runs/*.json, and how many
+    summaries they cover. Keyed on logs/runs.jsonl and the runs/ directory (os.replace writes bump
+    its mtime), so the table is only recomputed when either changes. Returns ([], False, 0) when there
+    are no summaries.
+    """
+    summaries = load_summaries()
+    from_runs_dir = False
+    if not summaries and runs_dir_stamp:
+        summaries = _summaries_from_runs_dir()
+        from_runs_dir = bool(summaries)
+    if not summaries:
+        return [], False, 0
+    by_arm = group_by_arm(summaries)
+    table: List[Dict[str, Any]] = []
+    for arm in ("monolith", "swarm"):
+        m = compute_all_metrics(summaries=by_arm.get(arm, []))
+        aq, tps, cps = m["average_quality"], m["tokens_per_success"], m["cost_per_success"]
+        table.append(
+            {
+                "arm": arm,
+                "SR": f"{m['success_rate']:.2%}",
+                "FPS": f"{m['first_pass_success']:.2%}",
+                "Avg Quality": "—" if aq is None else f"{aq:.2f}",
+                "Tokens/Success": "—" if not tps else f"{tps:.0f}",
+                "Cost/Success": "—" if not cps else f"${cps:.6f}",
+                "Tool Correctness": f"{m['tool_correctness']:.2%}",
+                "Policy Violation Rate": f"{m['policy_violation_rate']:.2%}",
+                "Critical Hallucination Rate": f"{m['critical_hallucination_rate']:.2%}",
+            }
+        )
+    return table, from_runs_dir, len(summaries)
+
+
 def main() -> None:
     st.set_page_config(page_title="Swarm Versonalities v1 — Dashboard", layout="wide")
     st.title("Swarm Versonalities v1 — Dashboard")
@@ -166,28 +286,10 @@ def main() -> None:
     if not tasks:
         st.warning("No tasks_v1.json / benchmark_v1.json found or tasks list is empty.")
     else:
-        rows = []
-        for t in tasks:
-            tid = t.get("id", "")
-            bucket = t.get("task_bucket", "")
-            prompt = t.get("prompt", "")
-            run = _load_run_file(tid)
-            has_run = run is not None
-            run_success = None
-            if run:
-                metrics = run.get("metrics") or {}
-                run_success = metrics.get("success")
-            rows.append(
-                {
-                    "task_id": tid,
-                    "task_bucket": bucket,
-                    "has_run_file": has_run,
-                    "run_success": run_success,
-                    "prompt": prompt,
-                }
-            )
-        st.caption(f"{len(tasks)} tasks in tasks_v1/benchmark_v1; {sum(1 for r in rows if r['has_run_file'])} have run outputs in runs/.")
-        st.dataframe(rows, use_container_width=True, hide_index=True)
+        tasks_path = _tasks_path()
+        frame = _coverage_table(tasks_path, _stamp(tasks_path), _stamp(RUNS_DIR))
+        st.caption(f"{len(tasks)} tasks in tasks_v1/benchmark_v1; {int(frame['has_run_file'].sum())} have run outputs in runs/.")
+        st.dataframe(frame, use_container_width=True, hide_index=True)
 
     # ------------------------------------------------------------------
     # 2) Aggregate metrics (summary_v1 + run summaries)
@@ -205,12 +307,8 @@ def main() -> None:
 
     with c2:
         st.subheader("Run summary metrics (logs/runs.jsonl)")
-        summaries = load_summaries()
-        from_runs_dir = False
-        if not summaries and os.path.isdir(RUNS_DIR):
-            summaries = _summaries_from_runs_dir()
-            from_runs_dir = bool(summaries)
-        if not summaries:
+        table, from_runs_dir, n_summaries = _arm_metrics_table(_stamp(SUMMARIES_PATH), _stamp(RUNS_DIR))
+        if not table:
             st.caption(
                 "No run summaries found. This panel is filled when you run the benchmark (batch_runner.py writes to logs/runs.jsonl). "
                 "The left panel uses results/summary_v1.json from runs/*.json, which is the main source of truth."
@@ -218,30 +316,8 @@ def main() -> None:
         else:
             if from_runs_dir:
                 st.caption("Derived from runs/*.json (logs/runs.jsonl was empty or missing).")
-            arms = ["monolith", "swarm"]
-            table: List[Dict[str, Any]] = []
-            for arm in arms:
-                sr = success_rate(summaries=summaries, arm=arm)
-                fps = first_pass_success(summaries=summaries, arm=arm)
-                aq = average_quality(summaries=summaries, arm=arm)
-                tps = tokens_per_success(summaries=summaries, arm=arm)
-                cps = cost_per_success(summaries=summaries, arm=arm)
-                tc = tool_correctness(summaries=summaries, arm=arm)
-                pvr = policy_violation_rate(summaries=summaries, arm=arm)
-                chr_ = critical_hallucination_rate(summaries=summaries, arm=arm)
-                table.append(
-                    {
-                        "arm": arm,
-                        "SR": f"{sr:.2%}",
-                        "FPS": f"{fps:.2%}",
-                        "Avg Quality": "—" if aq is None else f"{aq:.2f}",
-                        "Tokens/Success": "—" if not tps else f"{tps:.0f}",
-                        "Cost/Success": "—" if not cps else f"${cps:.6f}",
-                        "Tool Correctness": f"{tc:.2%}",
-                        "Policy Violation Rate": f"{pvr:.2%}",
-                        "Critical Hallucination Rate": f"{chr_:.2%}",
-                    }
-                )
+            else:
+                st.caption(f"{n_summaries} run summaries logged.")
             st.dataframe(table, use_container_width=True, hide_index=True)
 
     # ------------------------------------------------------------------
@@ -322,13 +398,14 @@ def main() -> None:
     # 6) External reports
     # ------------------------------------------------------------------
     st.header("6) External reports")
-    reports_obj = _load_json(EXTERNAL_REPORTS_PATH)
+    reports_stamp = _stamp(EXTERNAL_REPORTS_PATH)
+    reports_obj = _load_json_at(EXTERNAL_REPORTS_PATH, reports_stamp)
     if not reports_obj:
         st.caption("No external_reports.json found or file is empty.")
     else:
         if isinstance(reports_obj, list):
             st.caption(f"{len(reports_obj)} external reports normalized.")
-            st.dataframe(reports_obj, use_container_width=True, hide_index=True)
+            st.dataframe(_reports_frame(reports_stamp), use_container_width=True, hide_index=True)
         else:
             st.json(reports_obj)
 
@@ -7,17 +7,22 @@ Writes metrics.baseline_quality_score, metrics.swarm_quality_score,
 metrics.baseline_constraint_adherence, metrics.swarm_constraint_adherence back into the run file.
 
 Run after batch_runner.py and before aggregate_results.py so ASR uses these scores.
-Requires GROQ_API_KEY.
+Requires GROQ_API_KEY. SWARM_EVAL_WORKERS=N scores N runs at once (default 1). Failed evaluations
+(API errors such as 429s, unparseable replies) leave the old scores and are counted in the final report.
 """
 
-import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from jsonio import dump_path, load_path
 from pipeline import call_api
 
 _BASE = os.path.dirname(os.path.abspath(__file__))
 RUNS_DIR = os.path.join(_BASE, "runs")
+# Runs scored at once; each makes up to two Groq calls. Like SWARM_WORKERS, raise it only within your
+# Groq RPM limit (or set SWARM_GROQ_RPM to pace the calls).
+EVAL_WORKERS = max(1, int(os.environ.get("SWARM_EVAL_WORKERS", "1")))
 
 EVAL_SYSTEM = """You are an evaluator. Reply with exactly two numbers on one line: quality constraint_adherence.
 - quality: 0 to 5 (5 = excellent, correct, complete; 0 = wrong or empty).
@@ -25,18 +30,46 @@ EVAL_SYSTEM = """You are an evaluator. Reply with exactly two numbers on one lin
 Output format: two numbers separated by a space, e.g. 4.0 0.95"""
 
 
-def _score_output(task_prompt: str, output: str, arm: str) -> tuple[float | None, float | None]:
-    """Call LLM to score one output. Returns (quality, constraint_adherence) or (None, None) on parse failure."""
+_NUMBER_RE = re.compile(r"[0-9]+\.?[0-9]*")
+
+
+def _is_plain_number(token: str) -> bool:
+    """ASCII digits with at most one '.', starting with a digit (exactly what _NUMBER_RE matches whole)."""
+    return token.isascii() and token[:1].isdigit() and token.replace(".", "", 1).isdigit()
+
+
+def _two_numbers(content: str) -> list[str] | None:
+    """First two numbers in the evaluator reply, or None if it has fewer than two."""
+    # Fast path for the requested "3.5 0.9" / "4, 1.0" shape: check the first two tokens directly.
+    tokens = content.split(None, 2)[:2]
+    if len(tokens) == 2:
+        tokens = [t.strip(",;") for t in tokens]
+        if _is_plain_number(tokens[0]) and _is_plain_number(tokens[1]):
+            return tokens
+    # Prose reply (e.g. "Quality: 4, adherence 0.9"): scan for digit runs anywhere.
+    numbers = _NUMBER_RE.findall(content)
+    return numbers[:2] if len(numbers) >= 2 else None
+
+
+# Characters of task prompt / output sent to the evaluator.
+_PROMPT_CHARS = 2000
+_OUTPUT_CHARS = 4000
+
+
+def _score_output(prompt_head: str, output: str, arm: str) -> tuple[float | None, float | None]:
+    """
+    Call LLM to score one output. prompt_head is the task prompt already cut to _PROMPT_CHARS.
+    Returns (quality, constraint_adherence) or (None, None) on parse failure.
+    """
     if not (output or "").strip():
         return None, None
-    user = f"Task:\n{task_prompt[:2000]}\n\nOutput ({arm}):\n{output[:4000]}\n\nScore quality 0-5 and constraint_adherence 0-1. One line: quality constraint_adherence"
+    user = f"Task:\n{prompt_head}\n\nOutput ({arm}):\n{output[:_OUTPUT_CHARS]}\n\nScore quality 0-5 and constraint_adherence 0-1. One line: quality constraint_adherence"
     try:
         content, _, _ = call_api([{"role": "system", "content": EVAL_SYSTEM}, {"role": "user", "content": user}])
     except Exception:
         return None, None
-    # Parse "3.5 0.9" or "4 1.0"
-    numbers = re.findall(r"[0-9]+\.?[0-9]*", (content or "").strip())
-    if len(numbers) >= 2:
+    numbers = _two_numbers(content or "")
+    if numbers is not None:
         try:
             q = max(0.0, min(5.0, float(numbers[0])))
             c = max(0.0, min(1.0, float(numbers[1])))
@@ -48,25 +81,54 @@ def _score_output(task_prompt: str, output: str, arm: str) -> tuple[float | None
 
 def evaluate_run(run: dict, task_prompt: str) -> dict:
     """Update run['metrics'] with quality and constraint_adherence for baseline and swarm when output exists."""
+    _evaluate(run, task_prompt)
+    return run
+
+
+def _evaluate(run: dict, task_prompt: str) -> int:
+    """evaluate_run; returns how many non-empty outputs could not be scored (API error or bad reply)."""
+    failed = 0
     metrics = run.get("metrics") or {}
-    updated = dict(metrics)
+    run["metrics"] = metrics  # updated in place; the scores below are the only keys written
+    prompt_head = task_prompt[:_PROMPT_CHARS]  # shared by both arms' requests
 
     if run.get("baseline_output") is not None:
-        q, c = _score_output(task_prompt, run["baseline_output"], "baseline")
+        q, c = _score_output(prompt_head, run["baseline_output"], "baseline")
+        failed += q is None and bool(run["baseline_output"].strip())
         if q is not None:
-            updated["baseline_quality_score"] = q
+            metrics["baseline_quality_score"] = q
         if c is not None:
-            updated["baseline_constraint_adherence"] = c
+            metrics["baseline_constraint_adherence"] = c
 
     if run.get("swarm_output") is not None:
-        q, c = _score_output(task_prompt, run["swarm_output"], "swarm")
+        q, c = _score_output(prompt_head, run["swarm_output"], "swarm")
+        failed += q is None and bool(run["swarm_output"].strip())
         if q is not None:
-            updated["swarm_quality_score"] = q
+            metrics["swarm_quality_score"] = q
         if c is not None:
-            updated["swarm_constraint_adherence"] = c
+            metrics["swarm_constraint_adherence"] = c
+
+    return failed
+
+
+_SCORE_KEYS = (
+    "baseline_quality_score",
+    "baseline_constraint_adherence",
+    "swarm_quality_score",
+    "swarm_constraint_adherence",
+)
 
-    run["metrics"] = updated
-    return run
+
+def _scores(run: dict) -> tuple:
+    metrics = run.get("metrics") or {}
+    return tuple(metrics.get(k) for k in _SCORE_KEYS)
+
+
+def _evaluate_changed(run: dict, task_prompt: str) -> tuple[bool, int]:
+    """evaluate_run; returns whether any score differs from what the file already had, and failures."""
+    before = _scores(run)
+    failed = _evaluate(run, task_prompt)
+    return _scores(run) != before, failed
 
 
 def main():
@@ -75,34 +137,43 @@ def main():
         return
     tasks_by_id = {}
     try:
-        with open(os.path.join(_BASE, "tasks_v1.json"), "r", encoding="utf-8") as f:
-            tasks_by_id = {t["id"]: t.get("prompt", "") for t in json.load(f).get("tasks", [])}
+        tasks = load_path(os.path.join(_BASE, "tasks_v1.json")).get("tasks", [])
+        tasks_by_id = {t["id"]: t.get("prompt", "") for t in tasks}
     except Exception:
         pass
     if not tasks_by_id:
         try:
-            with open(os.path.join(_BASE, "benchmark_v1.json"), "r", encoding="utf-8") as f:
-                tasks_by_id = {t["id"]: t.get("prompt", "") for t in json.load(f).get("tasks", [])}
+            tasks = load_path(os.path.join(_BASE, "benchmark_v1.json")).get("tasks", [])
+            tasks_by_id = {t["id"]: t.get("prompt", "") for t in tasks}
         except Exception:
             pass
 
-    n_updated = 0
-    for name in sorted(os.listdir(RUNS_DIR)):
-        if not name.endswith(".json"):
-            continue
-        path = os.path.join(RUNS_DIR, name)
-        task_id = name[:-5]
-        prompt = tasks_by_id.get(task_id, "")
+    # Each run file is scored and written independently, so directory order is fine (no sort).
+    jobs = []  # (path, run, prompt)
+    with os.scandir(RUNS_DIR) as it:
+        entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+    for entry in entries:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                run = json.load(f)
-        except (json.JSONDecodeError, OSError):
+            run = load_path(entry.path)
+        except (ValueError, OSError):
             continue
-        evaluate_run(run, prompt)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(run, f, indent=2, ensure_ascii=False)
-        n_updated += 1
+        jobs.append((entry.path, run, tasks_by_id.get(entry.name[:-5], "")))
+
+    # Scoring is network-bound, so runs are scored on a thread pool; each file is written back as soon
+    # as its run is scored (evaluate_run updates the run dict in place), and only if a score changed
+    # (empty outputs and failed/unparseable evaluator calls leave the file as it was).
+    n_updated = n_failed = 0
+    with ThreadPoolExecutor(max_workers=EVAL_WORKERS, thread_name_prefix="eval") as pool:
+        futures = {pool.submit(_evaluate_changed, run, prompt): (path, run) for path, run, prompt in jobs}
+        for future in as_completed(futures):
+            changed, failed = future.result()
+            n_failed += failed
+            if changed:
+                dump_path(*futures[future])
+                n_updated += 1
     print(f"Updated quality/constraint_adherence in {n_updated} run files under {RUNS_DIR}")
+    if n_failed:
+        print(f"{n_failed} outputs could not be scored (API error or unparseable reply) and kept their previous scores; rerun to retry.")
 
 
 if __name__ == "__main__":
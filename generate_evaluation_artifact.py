@@ -4,10 +4,12 @@ Summarizes: deltas, where versonalities helped or hurt, cost/efficiency tradeoff
 Per Evaluation Spec v0.1. Does not run tasks or modify benchmarks.
 """
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from jsonio import dump_path, load_path
+
 _BASE = os.path.dirname(os.path.abspath(__file__))
 RESULTS_DIR = os.path.join(_BASE, "results")
 RUNS_DIR = os.path.join(_BASE, "runs")
@@ -18,26 +20,29 @@ ARTIFACT_TXT_PATH = os.path.join(RESULTS_DIR, "internal_evaluation.txt")
 
 def _load_summary():
     try:
-        with open(SUMMARY_V1_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError, OSError):
+        return load_path(SUMMARY_V1_PATH)
+    except (OSError, ValueError):
+        return None
+
+
+def _load_run(path):
+    try:
+        return load_path(path)
+    except (ValueError, OSError):
         return None
 
 
 def _load_runs():
+    """
+    Parse runs/*.json in name order (the helped/hurt/neutral lists keep it); files are read on a
+    small thread pool (I/O overlaps).
+    """
     if not os.path.isdir(RUNS_DIR):
         return []
-    runs = []
-    for name in sorted(os.listdir(RUNS_DIR)):
-        if not name.endswith(".json"):
-            continue
-        path = os.path.join(RUNS_DIR, name)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                runs.append(json.load(f))
-        except (json.JSONDecodeError, OSError):
-            continue
-    return runs
+    with os.scandir(RUNS_DIR) as it:
+        paths = sorted(e.path for e in it if e.name.endswith(".json") and e.is_file())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        return [run for run in pool.map(_load_run, paths) if run is not None]
 
 
 def _ts():
@@ -119,29 +124,33 @@ def generate():
     }
 
     # Short narrative
+    tradeoff = artifact["cost_efficiency_tradeoff"]
+    helped_ids = [x["task_id"] for x in helped]
+    hurt_ids = [x["task_id"] for x in hurt]
+    neutral_ids = [x["task_id"] for x in neutral]
     lines = [
         "Internal evaluation artifact (Evaluation Spec v0.1)",
-        "Generated: " + artifact["generated_at"],
+        f"Generated: {artifact['generated_at']}",
         "",
         "ASR = SR × (quality/5) × constraint_adherence (per run, then averaged).",
-        "Avg quality (baseline, swarm): " + str(avg_quality),
-        "Avg constraint adherence (baseline, swarm): " + str(avg_constraint),
+        f"Avg quality (baseline, swarm): {avg_quality}",
+        f"Avg constraint adherence (baseline, swarm): {avg_constraint}",
         "Deltas:",
-        "  Quality delta (swarm − baseline): " + str(quality_delta),
-        "  Constraint adherence delta: " + str(constraint_delta),
-        "  Token cost delta (swarm − baseline): " + str(token_delta),
-        "  VPD (ASR delta): " + str(vpd),
+        f"  Quality delta (swarm − baseline): {quality_delta}",
+        f"  Constraint adherence delta: {constraint_delta}",
+        f"  Token cost delta (swarm − baseline): {token_delta}",
+        f"  VPD (ASR delta): {vpd}",
         "",
         "Cost/efficiency:",
-        "  Swarm uses more tokens: " + str(artifact["cost_efficiency_tradeoff"]["swarm_uses_more_tokens"]),
-        "  Baseline avg tokens: " + str(baseline_sr.get("avg_tokens_used")),
-        "  Swarm avg tokens: " + str(swarm_sr.get("avg_tokens_used")),
+        f"  Swarm uses more tokens: {tradeoff['swarm_uses_more_tokens']}",
+        f"  Baseline avg tokens: {tradeoff['baseline_avg_tokens']}",
+        f"  Swarm avg tokens: {tradeoff['swarm_avg_tokens']}",
         "",
-        "Where versonalities helped (task_ids): " + str([x["task_id"] for x in helped]),
-        "Where versonalities hurt (task_ids): " + str([x["task_id"] for x in hurt]),
-        "Neutral (task_ids): " + str([x["task_id"] for x in neutral]),
+        f"Where versonalities helped (task_ids): {helped_ids}",
+        f"Where versonalities hurt (task_ids): {hurt_ids}",
+        f"Neutral (task_ids): {neutral_ids}",
         "",
-        "Notable failures: " + str(failures),
+        f"Notable failures: {failures}",
     ]
     narrative = "\n".join(lines)
 
@@ -154,8 +163,7 @@ def main():
     if artifact is None:
         print("No summary_v1.json found. Run batch_runner.py then aggregate_results.py first.")
         return
-    with open(ARTIFACT_JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(artifact, f, indent=2, ensure_ascii=False)
+    dump_path(ARTIFACT_JSON_PATH, artifact)
     with open(ARTIFACT_TXT_PATH, "w", encoding="utf-8") as f:
         f.write(narrative)
     print("Wrote", ARTIFACT_JSON_PATH, "and", ARTIFACT_TXT_PATH)
@@ -0,0 +1,59 @@
+"""
+JSON read/write helpers shared by the runner, aggregation, and reporting scripts.
+
+Uses orjson when it is installed (optional; `pip install orjson`) and falls back
+to the stdlib json module otherwise. Output is UTF-8 (no ASCII escaping) either way.
+Decode errors subclass json.JSONDecodeError / ValueError in both backends.
+"""
+
+import json
+import os
+import threading
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup only
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes. indent=True gives 2-space pretty output."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def load_path(path: str) -> Any:
+    """Read and parse a JSON file in one read (binary; no text-layer decode)."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_path(path: str, obj: Any) -> None:
+    """Write obj to path as pretty (2-space) JSON.
+
+    Writes to a temp file next to path and renames it into place (os.replace is
+    atomic on POSIX and Windows), so concurrent readers never see a partial file.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(dumps(obj, indent=True))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,160 @@
+"""
+On-disk LLM response cache for deterministic reruns (opt-in: SWARM_LLM_CACHE=1).
+
+One JSON file per request under runs/.llm_cache/ (override with SWARM_LLM_CACHE_DIR), named by
+the SHA-256 of the canonical request (model, messages, temperature). Entries keep the content and
+the usage reported when the response was first fetched.
+
+Near-duplicate lookup (opt-in: SWARM_LLM_CACHE_SIMILARITY=<ratio>, e.g. 0.92): single-message
+prompts are also listed in index.jsonl, and a miss can be served by the most similar indexed
+prompt (difflib ratio over whitespace/case-normalized text) at or above the threshold. The index is
+parsed once per process and then read incrementally as it grows.
+
+In-process memo (opt-in: SWARM_MEMO=1): an LRU dict of exact requests for the life of the
+process, checked before the disk cache; no I/O at all on a hit.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Any, Optional
+
+from jsonio import dumps, load_path
+
+_BASE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("SWARM_LLM_CACHE_DIR", os.path.join(_BASE, "runs", ".llm_cache"))
+INDEX_PATH = os.path.join(CACHE_DIR, "index.jsonl")
+
+_INDEX_LOCK = threading.Lock()
+# Parsed index.jsonl, per (model, temperature): [(normalized prompt, key), ...]. Lookups read only
+# the bytes appended since the previous one (by this or any other process).
+_INDEX: dict = {}
+_INDEX_OFFSET = 0
+
+MEMO_MAXSIZE = 4096
+_MEMO: "OrderedDict[tuple, tuple]" = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+
+
+def make_key(model: str, messages: list, temperature: float, stop: Optional[tuple] = None) -> str:
+    """SHA-256 hex digest of the request; identical requests map to the same key."""
+    request = {"model": model, "messages": messages, "temperature": temperature}
+    if stop:  # only when set, so keys of requests without stop sequences are unchanged
+        request["stop"] = list(stop)
+    payload = json.dumps(
+        request,
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def get(key: str) -> Optional[dict]:
+    """Cached entry for key, or None on a miss (or an unreadable entry)."""
+    try:
+        return load_path(_path(key))
+    except (ValueError, OSError):
+        return None
+
+
+def put(key: str, value: dict[str, Any]) -> None:
+    """Store value under key. Best-effort; written via temp file + rename so readers never see a partial entry."""
+    path = _path(key)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(dumps(value))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def add_to_index(model: str, temperature: float, prompt: str, key: str) -> None:
+    """List prompt (stored under key) for near-duplicate lookup. Best-effort."""
+    line = json.dumps(
+        {"model": model, "temperature": temperature, "prompt": _normalize(prompt), "key": key},
+        ensure_ascii=False,
+    )
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with _INDEX_LOCK, open(INDEX_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError:
+        pass
+
+
+def _index_entries(model: str, temperature: float) -> list:
+    """Indexed (prompt, key) pairs for model/temperature, after reading any new index lines."""
+    global _INDEX_OFFSET
+    with _INDEX_LOCK:
+        try:
+            with open(INDEX_PATH, "rb") as f:
+                if os.fstat(f.fileno()).st_size < _INDEX_OFFSET:  # truncated or replaced: start over
+                    _INDEX.clear()
+                    _INDEX_OFFSET = 0
+                f.seek(_INDEX_OFFSET)
+                data = f.read()
+        except OSError:
+            data = b""
+        end = data.rfind(b"\n") + 1  # a line still being written is picked up next time
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                _INDEX.setdefault((entry["model"], entry["temperature"]), []).append((entry["prompt"], entry["key"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+        _INDEX_OFFSET += end
+        return list(_INDEX.get((model, temperature), ()))
+
+
+def find_similar(model: str, temperature: float, prompt: str, threshold: float) -> Optional[dict]:
+    """Entry of the most similar indexed prompt with ratio >= threshold, or None."""
+    entries = _index_entries(model, temperature)
+    if not entries:
+        return None
+    matcher = SequenceMatcher(autojunk=False)
+    matcher.set_seq2(_normalize(prompt))  # seq2 is the side SequenceMatcher precomputes
+    best_key, best = None, threshold
+    for indexed_prompt, key in entries:
+        matcher.set_seq1(indexed_prompt)
+        # Cheap upper bounds first; ratio() is quadratic in the worst case.
+        if matcher.real_quick_ratio() < best or matcher.quick_ratio() < best:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= best:
+            best_key, best = key, ratio
+    return get(best_key) if best_key is not None else None
+
+
+def memo_key(model: str, messages: list, temperature: float, stop: Optional[tuple] = None) -> tuple:
+    """Hashable in-process key for a request."""
+    return (model, temperature, tuple((m["role"], m["content"]) for m in messages), stop)
+
+
+def memo_get(key: tuple) -> Optional[tuple]:
+    with _MEMO_LOCK:
+        value = _MEMO.get(key)
+        if value is not None:
+            _MEMO.move_to_end(key)
+        return value
+
+
+def memo_put(key: tuple, value: tuple) -> None:
+    with _MEMO_LOCK:
+        _MEMO[key] = value
+        _MEMO.move_to_end(key)
+        if len(_MEMO) > MEMO_MAXSIZE:
+            _MEMO.popitem(last=False)
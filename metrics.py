@@ -3,42 +3,120 @@ Derived metrics computed from persisted run summaries.
 Computed on read; not logged. Clear boundaries for Phase 2 extensions.
 """
 
-import json
 import os
-from typing import List, Optional
+import stat
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
+from jsonio import loads
 from run_logging import SUMMARIES_PATH
 
+# runs.jsonl is append-only, so parsed lines are kept per path and later calls only parse what was
+# appended. path -> (st_ino, st_size, st_mtime_ns, bytes consumed through the last newline, summaries)
+_SUMMARIES_CACHE: Dict[str, Tuple[int, int, int, int, List[dict]]] = {}
+_SUMMARIES_LOCK = threading.Lock()
+
 
 def load_summaries(path: Optional[str] = None) -> List[dict]:
-    """Load run summaries from JSONL. Returns list of summary dicts."""
+    """
+    Load run summaries from JSONL. Returns list of summary dicts.
+    Repeat calls parse only lines appended since the last call; the file is re-read from the start
+    if it shrank, was replaced (new inode) or was rewritten at the same size.
+    """
     p = path or SUMMARIES_PATH
-    if not os.path.isfile(p):
+    try:
+        st = os.stat(p)
+    except OSError:
         return []
-    out = []
-    with open(p, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            out.append(json.loads(line))
-    return out
-
-
-def _filter(
-    summaries: List[dict],
+    if not stat.S_ISREG(st.st_mode):
+        return []
+    with _SUMMARIES_LOCK:
+        cached = _SUMMARIES_CACHE.get(p)
+        if cached is not None and cached[:3] == (st.st_ino, st.st_size, st.st_mtime_ns):
+            return list(cached[4])
+        offset, parsed = 0, []
+        if cached is not None and cached[0] == st.st_ino and st.st_size > cached[1]:
+            offset, parsed = cached[3], cached[4]
+        # One binary read of the unparsed part; each line is parsed straight from bytes.
+        with open(p, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        new = [loads(line) for line in data[:end].splitlines() if line.strip()]
+        # A trailing line without its newline yet is returned but not cached (it may still be growing).
+        tail = [loads(data[end:])] if data[end:].strip() else []
+        parsed = parsed + new
+        _SUMMARIES_CACHE[p] = (st.st_ino, st.st_size, st.st_mtime_ns, offset + end, parsed)
+        return parsed + tail
+
+
+def group_by_arm(summaries: List[dict]) -> Dict[str, List[dict]]:
+    """
+    Partition summaries by "arm" in one pass. Callers reporting per arm pass each group to
+    compute_all_metrics instead of re-filtering the full list once per arm.
+    """
+    groups: Dict[str, List[dict]] = defaultdict(list)
+    for s in summaries:
+        groups[s.get("arm")].append(s)
+    return dict(groups)
+
+
+def compute_all_metrics(
+    summaries: Optional[List[dict]] = None,
+    path: Optional[str] = None,
     arm: Optional[str] = None,
     task_bucket: Optional[str] = None,
-    first_pass_only: bool = False,
-) -> List[dict]:
-    subset = summaries
-    if arm is not None:
-        subset = [s for s in subset if s.get("arm") == arm]
-    if task_bucket is not None:
-        subset = [s for s in subset if s.get("task_bucket") == task_bucket]
-    if first_pass_only:
-        subset = [s for s in subset if s.get("retry_count", 0) == 0]
-    return subset
+) -> dict:
+    """
+    Every metric below for the filtered runs, in a single pass over the summaries.
+    Keys: success_rate, first_pass_success, tokens_per_success, cost_per_success, tool_correctness,
+    policy_violation_rate, critical_hallucination_rate, average_quality (same values and empty-set
+    defaults as the individual functions, which read their value from here).
+    """
+    data = summaries if summaries is not None else load_summaries(path)
+    n = n_succ = n_first = n_first_succ = n_policy = n_hallu = 0
+    tokens_succ = 0
+    cost_succ = 0.0
+    tool_calls = tool_ok = 0
+    quality_sum = 0
+    n_quality = 0
+    for s in data:
+        if arm is not None and s.get("arm") != arm:
+            continue
+        if task_bucket is not None and s.get("task_bucket") != task_bucket:
+            continue
+        n += 1
+        o = s.get("outcome") or {}
+        u = s.get("usage") or {}
+        ok = bool(o.get("success"))
+        if ok:
+            n_succ += 1
+            tokens_succ += (u.get("tokens_in") or 0) + (u.get("tokens_out") or 0)
+            cost_succ += (s.get("cost_usd") or {}).get("total") or 0.0
+        if s.get("retry_count", 0) == 0:
+            n_first += 1
+            n_first_succ += ok
+        tool_calls += u.get("tool_calls", 0) or 0
+        tool_ok += u.get("tool_calls_ok", 0) or 0
+        if o.get("policy_violation"):
+            n_policy += 1
+        if o.get("hallucination_critical"):
+            n_hallu += 1
+        q = (s.get("scores") or {}).get("quality")
+        if q is not None:
+            quality_sum += float(q)
+            n_quality += 1
+    return {
+        "success_rate": n_succ / n if n else 0.0,
+        "first_pass_success": n_first_succ / n_first if n_first else 0.0,
+        "tokens_per_success": tokens_succ / n_succ if n_succ else 0.0,
+        "cost_per_success": cost_succ / n_succ if n_succ else 0.0,
+        "tool_correctness": tool_ok / tool_calls if tool_calls else 0.0,
+        "policy_violation_rate": n_policy / n if n else 0.0,
+        "critical_hallucination_rate": n_hallu / n if n else 0.0,
+        "average_quality": quality_sum / n_quality if n_quality else None,
+    }
 
 
 def success_rate(
@@ -48,11 +126,7 @@ def success_rate(
     task_bucket: Optional[str] = None,
 ) -> float:
     """Fraction of runs that succeeded. 0.0 if no runs."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    if not data:
-        return 0.0
-    return sum(1 for s in data if s.get("outcome", {}).get("success")) / len(data)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["success_rate"]
 
 
 def first_pass_success(
@@ -62,11 +136,7 @@ def first_pass_success(
     task_bucket: Optional[str] = None,
 ) -> float:
     """Fraction of first-pass runs (retry_count==0) that succeeded. 0.0 if no first-pass runs."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket, first_pass_only=True)
-    if not data:
-        return 0.0
-    return sum(1 for s in data if s.get("outcome", {}).get("success")) / len(data)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["first_pass_success"]
 
 
 def tokens_per_success(
@@ -76,16 +146,7 @@ def tokens_per_success(
     task_bucket: Optional[str] = None,
 ) -> float:
     """Mean (tokens_in + tokens_out) per successful run. 0.0 if no successes."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    successful = [s for s in data if s.get("outcome", {}).get("success")]
-    if not successful:
-        return 0.0
-    total = 0
-    for s in successful:
-        u = s.get("usage") or {}
-        total += u.get("tokens_in", 0) + u.get("tokens_out", 0)
-    return total / len(successful)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["tokens_per_success"]
 
 
 def cost_per_success(
@@ -95,13 +156,7 @@ def cost_per_success(
     task_bucket: Optional[str] = None,
 ) -> float:
     """Mean cost_usd.total per successful run. 0.0 if no successes."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    successful = [s for s in data if s.get("outcome", {}).get("success")]
-    if not successful:
-        return 0.0
-    total = sum((s.get("cost_usd") or {}).get("total", 0.0) for s in successful)
-    return total / len(successful)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["cost_per_success"]
 
 
 # ---------------------------------------------------------------------------
@@ -119,17 +174,7 @@ def tool_correctness(
     Tool Correctness (TC) = tool_calls_ok / tool_calls across the filtered set.
     Returns 0.0 when there are no tool calls.
     """
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    total_calls = 0
-    total_ok = 0
-    for s in data:
-        u = s.get("usage") or {}
-        total_calls += u.get("tool_calls", 0) or 0
-        total_ok += u.get("tool_calls_ok", 0) or 0
-    if total_calls == 0:
-        return 0.0
-    return total_ok / total_calls
+    return compute_all_metrics(summaries, path, arm, task_bucket)["tool_correctness"]
 
 
 def policy_violation_rate(
@@ -139,16 +184,7 @@ def policy_violation_rate(
     task_bucket: Optional[str] = None,
 ) -> float:
     """Fraction of runs with outcome.policy_violation == True."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    if not data:
-        return 0.0
-    violations = 0
-    for s in data:
-        o = s.get("outcome") or {}
-        if o.get("policy_violation"):
-            violations += 1
-    return violations / len(data)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["policy_violation_rate"]
 
 
 def critical_hallucination_rate(
@@ -158,16 +194,7 @@ def critical_hallucination_rate(
     task_bucket: Optional[str] = None,
 ) -> float:
     """Fraction of runs with outcome.hallucination_critical == True."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    if not data:
-        return 0.0
-    crit = 0
-    for s in data:
-        o = s.get("outcome") or {}
-        if o.get("hallucination_critical"):
-            crit += 1
-    return crit / len(data)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["critical_hallucination_rate"]
 
 
 def average_quality(
@@ -177,17 +204,7 @@ def average_quality(
     task_bucket: Optional[str] = None,
 ) -> Optional[float]:
     """Mean rubric quality score (0–5) across filtered runs; None if no scores."""
-    data = summaries if summaries is not None else load_summaries(path)
-    data = _filter(data, arm=arm, task_bucket=task_bucket)
-    vals: List[float] = []
-    for s in data:
-        sc = s.get("scores") or {}
-        q = sc.get("quality")
-        if q is not None:
-            vals.append(float(q))
-    if not vals:
-        return None
-    return sum(vals) / len(vals)
+    return compute_all_metrics(summaries, path, arm, task_bucket)["average_quality"]
 
 
 def _format_pct(x: float) -> str:
@@ -216,30 +233,23 @@ if __name__ == "__main__":
     - Policy Violation Rate
     - Critical Hallucination Rate
     """
-    all_summaries = load_summaries()
+    by_arm = group_by_arm(load_summaries())
     arms = ["monolith", "swarm"]
     print("Arm, SR, FPS, AvgQuality, TokensPerSuccess, CostPerSuccess, ToolCorrectness, PolicyViolationRate, CriticalHallucinationRate")
     for arm in arms:
-        sr = success_rate(summaries=all_summaries, arm=arm)
-        fps = first_pass_success(summaries=all_summaries, arm=arm)
-        aq = average_quality(summaries=all_summaries, arm=arm)
-        tps = tokens_per_success(summaries=all_summaries, arm=arm)
-        cps = cost_per_success(summaries=all_summaries, arm=arm)
-        tc = tool_correctness(summaries=all_summaries, arm=arm)
-        pvr = policy_violation_rate(summaries=all_summaries, arm=arm)
-        chr_ = critical_hallucination_rate(summaries=all_summaries, arm=arm)
+        m = compute_all_metrics(summaries=by_arm.get(arm, []))
         print(
             ",".join(
                 [
                     arm,
-                    _format_pct(sr),
-                    _format_pct(fps),
-                    _format_float(aq, 2),
-                    _format_float(tps, 0),
-                    _format_float(cps, 6),
-                    _format_pct(tc),
-                    _format_pct(pvr),
-                    _format_pct(chr_),
+                    _format_pct(m["success_rate"]),
+                    _format_pct(m["first_pass_success"]),
+                    _format_float(m["average_quality"], 2),
+                    _format_float(m["tokens_per_success"], 0),
+                    _format_float(m["cost_per_success"], 6),
+                    _format_pct(m["tool_correctness"]),
+                    _format_pct(m["policy_violation_rate"]),
+                    _format_pct(m["critical_hallucination_rate"]),
                 ]
             )
         )
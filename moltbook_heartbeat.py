@@ -4,10 +4,17 @@ Moltbook Heartbeat: check status, DMs, feed. Optional skill-version check.
 Uses MOLTBOOK_API_KEY. Output follows heartbeat response format for Bintly.
 """
 
-import json
+import atexit
+import http.client
 import os
+import sys
+import threading
+import urllib.parse
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+from jsonio import loads
 
 BASE = "https://www.moltbook.com/api/v1"
 SKILL_JSON = "https://www.moltbook.com/skill.json"
@@ -20,26 +27,101 @@ def _auth_header() -> dict:
     return {"Authorization": f"Bearer {key}"}
 
 
+# Probes run on this long-lived pool, and each pool thread keeps one keep-alive connection per host
+# (http.client connections are not thread-safe). The threads outlive a heartbeat, so repeated
+# heartbeats in one process (e.g. a polling loop) reuse those connections instead of paying a
+# TLS handshake per request. close_connections() closes them; it also runs at exit.
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="heartbeat")
+_CONNECTIONS: dict = {}  # (thread ident, scheme, netloc) -> connection
+_CONNECTIONS_LOCK = threading.Lock()
+_USER_AGENT = f"Python-urllib/{sys.version_info[0]}.{sys.version_info[1]}"  # what urlopen sent
+
+
+def _connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    key = (threading.get_ident(), scheme, netloc)
+    with _CONNECTIONS_LOCK:
+        conn = _CONNECTIONS.get(key)
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = _CONNECTIONS[key] = cls(netloc, timeout=timeout)
+    conn.timeout = timeout
+    return conn
+
+
+def _drop_connection(scheme: str, netloc: str) -> None:
+    with _CONNECTIONS_LOCK:
+        conn = _CONNECTIONS.pop((threading.get_ident(), scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def close_connections() -> None:
+    """Close every pooled keep-alive connection (they reopen on the next request)."""
+    with _CONNECTIONS_LOCK:
+        conns = list(_CONNECTIONS.values())
+        _CONNECTIONS.clear()
+    for conn in conns:
+        conn.close()
+
+
+atexit.register(close_connections)
+
+
+def _uses_proxy(parts: urllib.parse.SplitResult) -> bool:
+    """True if urllib would send this URL through a proxy (HTTP(S)_PROXY set and NO_PROXY doesn't exempt it)."""
+    return parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _fetch(url: str, headers: dict | None = None, timeout: float = 15) -> bytes:
+    """GET url over a reused connection; raises like urlopen (HTTPError on 4xx/5xx, OSError on I/O).
+
+    Behind a proxy (see _uses_proxy) it is a plain urlopen, which handles the proxy.
+    """
+    parts = urllib.parse.urlsplit(url)
+    headers = {"User-Agent": _USER_AGENT, **(headers or {})}
+    if _uses_proxy(parts):
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as r:
+            return r.read()
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    for attempt in (1, 2):
+        conn = _connection(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request("GET", target, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+            break
+        except (http.client.HTTPException, OSError) as e:
+            _drop_connection(parts.scheme, parts.netloc)
+            # The server may have closed an idle keep-alive connection; a GET is safe to repeat once.
+            stale = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+            if attempt == 1 and stale:
+                continue
+            raise
+    if resp.will_close:
+        _drop_connection(parts.scheme, parts.netloc)
+    if 300 <= resp.status < 400:  # let urllib follow the redirect
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as r:
+            return r.read()
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    return raw
+
+
 def _get(path: str, params: dict | None = None) -> dict | list:
     url = f"{BASE}/{path.lstrip('/')}"
     if params:
         q = "&".join(f"{k}={v}" for k, v in params.items())
         url = f"{url}?{q}" if "?" not in path else f"{url}&{q}"
-    req = urllib.request.Request(url, headers=_auth_header(), method="GET")
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            raw = resp.read().decode("utf-8")
-            return json.loads(raw) if raw else {}
-    except (urllib.error.HTTPError, urllib.error.URLError, json.JSONDecodeError, OSError) as e:
+        raw = _fetch(url, _auth_header(), timeout=15)
+        return loads(raw) if raw else {}
+    except (urllib.error.HTTPError, urllib.error.URLError, http.client.HTTPException, ValueError, OSError) as e:
         return {"_error": str(e)}
 
 
 def _get_skill_version() -> str | None:
     try:
-        req = urllib.request.Request(SKILL_JSON)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            return data.get("version")
+        return loads(_fetch(SKILL_JSON, timeout=10)).get("version")
     except Exception:
         return None
 
@@ -60,13 +142,19 @@ def run_heartbeat(
     need_human = []
     dm_activity = []
 
+    # The probes are independent, so fetch them concurrently (wall time is the slowest RTT, not the sum).
+    skill_f = _POOL.submit(_get_skill_version) if check_skill else None
+    status_f = _POOL.submit(_get, "agents/status") if check_status else None
+    dm_f = _POOL.submit(_get, "agents/dm/check") if check_dm else None
+    feed_f = _POOL.submit(_get, "feed", {"sort": "new", "limit": "5"}) if check_feed else None
+
     if check_skill:
-        ver = _get_skill_version()
+        ver = skill_f.result()
         if ver:
             parts.append(f"Skill version: {ver}")
 
     if check_status:
-        status_data = _get("agents/status")
+        status_data = status_f.result()
         if isinstance(status_data, dict) and "_error" not in status_data:
             st = status_data.get("status", "")
             if st == "pending_claim":
@@ -77,7 +165,7 @@ def run_heartbeat(
                 parts.append(f"Agent status: {st}")
 
     if check_dm:
-        dm = _get("agents/dm/check")
+        dm = dm_f.result()
         if isinstance(dm, dict) and "_error" not in dm:
             pending = dm.get("pending_requests") or dm.get("pending_requests_count") or 0
             unread = dm.get("unread_messages") or dm.get("unread_count") or 0
@@ -92,7 +180,7 @@ def run_heartbeat(
                 dm_activity.append(f"{unread} unread DM(s)")
 
     if check_feed:
-        feed = _get("feed", {"sort": "new", "limit": "5"})
+        feed = feed_f.result()
         if isinstance(feed, list) and len(feed) > 0:
             parts.append(f"Feed: {len(feed)} recent items")
         elif isinstance(feed, dict) and "_error" not in feed:
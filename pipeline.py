@@ -5,7 +5,7 @@ Uses the Groq API only (official groq package). Requires GROQ_API_KEY.
 
 Contains:
 - MODEL / temperature / cost constants
-- call_api (Groq chat completions)
+- call_api (Groq chat completions; _chat also reports prompt-cache hits)
 - run_baseline (monolithic arm)
 - run_swarm (Swarm Versonalities arm)
 
@@ -13,27 +13,134 @@ No Streamlit imports here; this module is safe for offline batch runs.
 """
 
 import os
-from typing import List, Tuple
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import repeat
+from typing import List, Optional, Tuple
 
-from groq import Groq
+from groq import APIStatusError, Groq
+
+import llm_cache
 
 
 MODEL = "llama-3.1-8b-instant"
 TEMPERATURE = float(os.environ.get("SWARM_TEMPERATURE", "0"))
 COST_INPUT_PER_1M = float(os.environ.get("SWARM_COST_INPUT_PER_1M", "0.05"))
 COST_OUTPUT_PER_1M = float(os.environ.get("SWARM_COST_OUTPUT_PER_1M", "0.10"))
+# Opt-in: fuse Planner+Analyst and Critic+Builder into single calls (6 → 4 API calls).
+# Off by default so the frozen v1 protocol (one call per role) is what the benchmark runs.
+FUSE_ROLES = os.environ.get("SWARM_FUSE_ROLES", "0") == "1"
+# Opt-in, with SWARM_FUSE_ROLES=1: the Editor joins the Critic+Builder call as well (4 → 3 calls);
+# the final artifact is that reply's "### FINAL" section.
+FUSE_FINAL = os.environ.get("SWARM_FUSE_FINAL", "0") == "1"
+# Opt-in: SWARM_CONTEXT=handoff sends each role only the task plus the prior outputs it consumes
+# (see _HANDOFF_INPUTS) instead of replaying the full conversation. Default "full" is v1 behavior.
+HANDOFF_CONTEXT = os.environ.get("SWARM_CONTEXT", "full") == "handoff"
+# Opt-in: run Planner and a task-only Analyst concurrently, then Builder onward as usual
+# (v1 Analyst also sees the plan). Ignored when SWARM_FUSE_ROLES=1, which already merges the two.
+PARALLEL_PLAN = os.environ.get("SWARM_PARALLEL_PLAN", "0") == "1"
+# Opt-in: serve identical (model, messages, temperature) requests from the on-disk cache in llm_cache.py.
+LLM_CACHE = os.environ.get("SWARM_LLM_CACHE", "0") == "1"
+# With LLM_CACHE, also serve single-message prompts (the baseline arm) from the most similar cached
+# prompt at or above this difflib ratio, e.g. 0.92. Unset = exact matches only.
+LLM_CACHE_SIMILARITY = float(os.environ.get("SWARM_LLM_CACHE_SIMILARITY") or 0) or None
+# Opt-in: memoize identical requests in-process (e.g. repeated tasks in one batch or app session).
+MEMO = os.environ.get("SWARM_MEMO", "0") == "1"
+# Optional client-side pacing: at most this many Groq requests per minute across all threads in the
+# process (set it to your account's RPM when running batch_runner with --workers). Unset = no pacing.
+GROQ_RPM = float(os.environ.get("SWARM_GROQ_RPM") or 0) or None
+# Extra retries on HTTP 429 and transient 5xx (_RETRY_STATUSES), with exponential backoff (or the
+# server's Retry-After), on top of the Groq SDK's own retries. Other errors are never retried here.
+RATE_LIMIT_RETRIES = int(os.environ.get("SWARM_RATE_LIMIT_RETRIES", "0"))
+# Opt-in: when the Critic's feedback reads as an approval (_APPROVAL_RE), skip the Builder revision
+# and hand Builder's output straight to the Editor (6 → 5 calls). Ignored with SWARM_FUSE_ROLES=1.
+SKIP_APPROVED_REVISION = os.environ.get("SWARM_SKIP_APPROVED_REVISION", "0") == "1"
+# Opt-in: swarm calls carry a stop sequence at the start of a new "Role:" block, so a model that
+# starts writing the next role's turn is cut off server-side (no tokens billed past it).
+STOP_ROLE_HOP = os.environ.get("SWARM_STOP_ROLE_HOP", "0") == "1"
+# Opt-in: run a speculative Builder revision alongside the Critic. If the Critic approves (_APPROVAL_RE)
+# the revision is used and the Builder call after the Critic is skipped (one fewer serial call);
+# otherwise it is discarded (its tokens still count) and v1's revision runs. Ignored with
+# SWARM_FUSE_ROLES=1 or SWARM_SKIP_APPROVED_REVISION=1.
+SPECULATIVE_REVISION = os.environ.get("SWARM_SPECULATIVE_REVISION", "0") == "1"
+
+
+# Threads for calls that run concurrently within one swarm stage (network-bound; the Groq client is thread-safe).
+_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="swarm-call")
+
+
+class _RateLimiter:
+    """Thread-safe pacing: hands out one request slot every period/rate seconds (no bursts)."""
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self._interval = period / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_LIMITER: Optional[_RateLimiter] = _RateLimiter(GROQ_RPM) if GROQ_RPM else None
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_LOCK = threading.Lock()  # retries are counted from the _POOL threads
+
+
+def _retry_after(error: APIStatusError) -> Optional[float]:
+    """Seconds from the error response's Retry-After header, if present and numeric."""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _create_completion(client: Groq, on_retry=None, **kwargs):
+    """client.chat.completions.create, paced by _LIMITER and retried on _RETRY_STATUSES up to
+    RATE_LIMIT_RETRIES times. on_retry(n) is called before the n-th retry."""
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        if _LIMITER is not None:
+            _LIMITER.acquire()
+        try:
+            return client.chat.completions.create(**kwargs)
+        except APIStatusError as e:
+            if attempt == RATE_LIMIT_RETRIES or getattr(e, "status_code", None) not in _RETRY_STATUSES:
+                raise
+            if on_retry is not None:
+                on_retry(attempt + 1)
+            delay = _retry_after(e)
+            time.sleep(delay if delay is not None else min(60.0, 2.0 ** attempt) + random.uniform(0, 1))
+
+
+@lru_cache(maxsize=1)
+def _client_for_key(api_key: str) -> Groq:
+    """One Groq client (and HTTP connection pool) per API key; a changed GROQ_API_KEY gets a new one."""
+    return Groq(api_key=api_key)
 
 
 def _get_groq_client() -> Groq:
+    """Return the process-wide Groq client for the current GROQ_API_KEY, so its HTTP pool is reused across calls."""
     api_key = (os.environ.get("GROQ_API_KEY") or "").strip()
     if not api_key:
         raise ValueError(
             "GROQ_API_KEY is not set. Set it in your environment to use the Groq API.\n"
             "Example: export GROQ_API_KEY='your-key'"
         )
-    return Groq(api_key=api_key)
+    return _client_for_key(api_key)
 
 
+# Provider prefix caching (usage.prompt_tokens_details.cached_tokens) only pays off while prompts
+# share a byte-identical prefix. Keep SYSTEM_PROMPT and the role messages below static: no
+# timestamps, run/task ids or other per-run text, and nothing dynamic ahead of "Task:".
 SYSTEM_PROMPT = """You are part of a Swarm Versonalities v1 workflow. Follow these rules strictly:
 
 1. Use exactly ONE versonality at a time
@@ -45,6 +152,8 @@ SYSTEM_PROMPT = """You are part of a Swarm Versonalities v1 workflow. Follow the
 7. Editor: Produce the final clean artifact
 
 Current role will be specified in each message."""
+# Shared by every run's conversation; message dicts are only read (by the client and cache keys), never mutated.
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
 
 
 SWARM_ROLES: List[Tuple[str, str, str, str]] = [
@@ -56,19 +165,177 @@ SWARM_ROLES: List[Tuple[str, str, str, str]] = [
     ("editor", "finalize", "EDITOR", "Produce the final clean artifact. Output ONLY the final result, no meta-commentary."),
 ]
 
+_ROLES_BY_ID = {role[0]: role for role in SWARM_ROLES}
 
-def call_api(messages):
-    """Call Groq API (chat completions). Raises ValueError if GROQ_API_KEY is missing; raises groq.APIError on API errors."""
-    client = _get_groq_client()
-    response = client.chat.completions.create(
-        model=MODEL,
-        messages=messages,
-        temperature=TEMPERATURE,
-    )
-    content = response.choices[0].message.content
-    usage = getattr(response, "usage", None)
+# Per-role user messages, built once at import. Only the planner's depends on the task
+# ({task} is filled in per run); the rest are sent verbatim.
+_ROLE_USER_CONTENT = {
+    agent_id: f"Role: {role_name}\n\n{instruction}" for agent_id, _, role_name, instruction in SWARM_ROLES
+}
+_ROLE_USER_CONTENT["planner"] = "Role: PLANNER\n\nTask: {task}\n\n" + _ROLES_BY_ID["planner"][3]
+
+# Steps as (agent_ids, user content template). v1 runs one role per call; the fused steps
+# (SWARM_FUSE_ROLES=1) answer two roles in one call.
+_V1_STEPS: List[Tuple[Tuple[str, ...], str]] = [((agent_id,), _ROLE_USER_CONTENT[agent_id]) for agent_id, *_ in SWARM_ROLES]
+_FUSED_STEPS: List[Tuple[Tuple[str, ...], str]] = [
+    (
+        ("planner", "analyst"),
+        "Role: PLANNER, then ANALYST\n\nTask: {task}\n\n"
+        "First, as PLANNER: create a plan for completing this task. Do NOT solve it.\n"
+        "Then, as ANALYST: analyze the requirements and plan. Do NOT draft any output.\n\n"
+        "Reply with two sections headed exactly ### PLAN and ### ANALYSIS.",
+    ),
+    (("builder",), _ROLE_USER_CONTENT["builder"]),
+    (
+        ("critic", "builder2"),
+        "Role: CRITIC, then BUILDER\n\n"
+        "First, as CRITIC: review the output and provide feedback. Do NOT rewrite it.\n"
+        "Then, as BUILDER: revise the output based on that feedback.\n\n"
+        "Reply with two sections headed exactly ### FEEDBACK and ### REVISED.",
+    ),
+    (("editor",), _ROLE_USER_CONTENT["editor"]),
+]
+# SWARM_FUSE_FINAL=1: Critic, Builder revision and Editor in one call, after the first two fused steps.
+_FUSED_FINAL_STEP: Tuple[Tuple[str, ...], str] = (
+    ("critic", "builder2", "editor"),
+    "Role: CRITIC, then BUILDER, then EDITOR\n\n"
+    "First, as CRITIC: review the output and provide feedback. Do NOT rewrite it.\n"
+    "Then, as BUILDER: revise the output based on that feedback.\n"
+    "Finally, as EDITOR: produce the final clean artifact, with no meta-commentary.\n\n"
+    "Reply with three sections headed exactly ### FEEDBACK, ### REVISED and ### FINAL.",
+)
+_FINAL_HEADING_RE = re.compile(r"^###[ \t]*FINAL[ \t]*$", re.M | re.I)
+
+# Stages of steps; the calls within one stage run concurrently.
+_V1_STAGES = [[step] for step in _V1_STEPS]
+_FUSED_STAGES = [[step] for step in _FUSED_STEPS]
+_FUSED_FINAL_STAGES = _FUSED_STAGES[:2] + [[_FUSED_FINAL_STEP]]
+# SWARM_SPECULATIVE_REVISION=1: sent in the Critic's stage, before the feedback exists.
+_SPECULATIVE_REVISION_STEP: Tuple[Tuple[str, ...], str] = (
+    ("builder2",),
+    "Role: BUILDER\n\nRevise and polish the output.",
+)
+_PARALLEL_PLAN_STAGES = [
+    [
+        _V1_STEPS[0],
+        (("analyst",), "Role: ANALYST\n\nTask: {task}\n\nAnalyze the requirements of this task. Do NOT draft any output."),
+    ],
+] + _V1_STAGES[2:]
+
+# Prior role outputs each role consumes under SWARM_CONTEXT=handoff.
+_HANDOFF_INPUTS = {
+    "planner": (),
+    "analyst": ("planner",),
+    "builder": ("planner", "analyst"),
+    "critic": ("builder",),
+    "builder2": ("builder", "critic"),
+    "editor": ("builder2",),
+}
+
+# Critic phrasings treated as "no substantive changes" under SWARM_SKIP_APPROVED_REVISION. A cheap
+# heuristic: an occasional false positive only costs the revision pass.
+_APPROVAL_RE = re.compile(r"\b(no (?:major )?(?:issues|changes|feedback)|looks good|minor (?:nits|edits))\b", re.I)
+
+# Stop sequence for SWARM_STOP_ROLE_HOP. Needs the blank line before it, so a reply that opens by
+# echoing its own "Role: X" header is not cut to nothing.
+_ROLE_HOP_STOP = ("\n\nRole:",)
+
+
+def _chat(messages, on_delta=None, stop=None, on_retry=None):
+    """One chat completion; returns (content, tokens_in, tokens_out, cached_tokens_in, cache_hit).
+
+    cached_tokens_in is the part of the prompt the provider served from its prefix cache
+    (usage.prompt_tokens_details.cached_tokens; 0 when not reported). cache_hit is None unless
+    SWARM_MEMO=1 or SWARM_LLM_CACHE=1, in which case it tells whether the response was replayed
+    (in-process memo or llm_cache); hits report the usage recorded when it was first fetched.
+    If on_delta is given, the response is streamed and on_delta(text) is called per chunk
+    (once with the whole content on a replay). stop is an optional tuple of stop sequences.
+    on_retry(n) is called before each SWARM_RATE_LIMIT_RETRIES retry of the API call.
+    """
+    if not MEMO:
+        return _fetch(messages, on_delta, stop, on_retry)
+    key = llm_cache.memo_key(MODEL, messages, TEMPERATURE, stop)
+    hit = llm_cache.memo_get(key)
+    if hit is not None:
+        if on_delta is not None:
+            on_delta(hit[0])
+        return (*hit, True)
+    content, tokens_in, tokens_out, cached_in, cache_hit = _fetch(messages, on_delta, stop, on_retry)
+    llm_cache.memo_put(key, (content, tokens_in, tokens_out, cached_in))
+    return content, tokens_in, tokens_out, cached_in, bool(cache_hit)
+
+
+def _fetch(messages, on_delta=None, stop=None, on_retry=None):
+    """_chat without the in-process memo: on-disk cache (SWARM_LLM_CACHE=1), else the Groq API."""
+    key = None
+    # Near-duplicate lookup only for a bare user prompt (no role priming or history).
+    single_prompt = LLM_CACHE_SIMILARITY is not None and len(messages) == 1 and messages[0]["role"] == "user"
+    if LLM_CACHE:
+        key = llm_cache.make_key(MODEL, messages, TEMPERATURE, stop)
+        hit = llm_cache.get(key)
+        if hit is None and single_prompt:
+            hit = llm_cache.find_similar(MODEL, TEMPERATURE, messages[0]["content"], LLM_CACHE_SIMILARITY)
+        if hit is not None:
+            if on_delta is not None:
+                on_delta(hit["content"])
+            return hit["content"], hit["tokens_in"], hit["tokens_out"], hit["cached_tokens_in"], True
+    content, usage = _complete(messages, on_delta, stop, on_retry)
     tokens_in = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", 0) if usage else 0
     tokens_out = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", 0) if usage else 0
+    details = getattr(usage, "prompt_tokens_details", None) if usage else None
+    cached_in = getattr(details, "cached_tokens", None) or 0
+    if key is None:
+        return content, tokens_in, tokens_out, cached_in, None
+    llm_cache.put(key, {"content": content, "tokens_in": tokens_in, "tokens_out": tokens_out, "cached_tokens_in": cached_in})
+    if single_prompt:
+        llm_cache.add_to_index(MODEL, TEMPERATURE, messages[0]["content"], key)
+    return content, tokens_in, tokens_out, cached_in, False
+
+
+def _complete(messages, on_delta=None, stop=None, on_retry=None):
+    """Groq API call; returns (content, usage). With on_delta, streams and calls on_delta(text) per chunk."""
+    client = _get_groq_client()
+    kwargs = {"model": MODEL, "messages": messages, "temperature": TEMPERATURE}
+    if stop:
+        kwargs["stop"] = list(stop)
+    if on_delta is None:
+        response = _create_completion(client, on_retry, **kwargs)
+        return response.choices[0].message.content, getattr(response, "usage", None)
+    stream = _create_completion(client, on_retry, stream=True, **kwargs)
+    parts = []
+    usage = None
+    for chunk in stream:
+        if chunk.choices:
+            text = chunk.choices[0].delta.content
+            if text:
+                parts.append(text)
+                on_delta(text)
+        # Groq reports usage on the last chunk under x_groq; OpenAI-style servers use chunk.usage.
+        usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+    return "".join(parts), usage
+
+
+def _record_usage(usage: Optional[dict], cached_in: int, cache_hit: Optional[bool]) -> None:
+    """Accumulate per-arm extras into the caller's usage dict (prompt-cache tokens, LLM cache hits)."""
+    if usage is None:
+        return
+    usage["calls"] = usage.get("calls", 0) + 1
+    usage["cached_tokens_in"] = usage.get("cached_tokens_in", 0) + cached_in
+    if cache_hit is not None:
+        usage["llm_cache_hits"] = usage.get("llm_cache_hits", 0) + cache_hit
+
+
+def _record_retry(usage: Optional[dict]) -> None:
+    """Count one SWARM_RATE_LIMIT_RETRIES retry in the caller's usage dict (usage["retries"])."""
+    if usage is None:
+        return
+    with _RETRY_LOCK:
+        usage["retries"] = usage.get("retries", 0) + 1
+
+
+def call_api(messages):
+    """Call Groq API (chat completions). Raises ValueError if GROQ_API_KEY is missing; raises groq.APIError on API errors."""
+    content, tokens_in, tokens_out, _, _ = _chat(messages)
     return content, tokens_in, tokens_out
 
 
@@ -76,13 +343,32 @@ def cost_usd(tokens_in: int, tokens_out: int) -> float:
     return (tokens_in * COST_INPUT_PER_1M + tokens_out * COST_OUTPUT_PER_1M) / 1e6
 
 
-def run_baseline(task: str, run_id: str, task_id: str, task_bucket: str = "", *, log_event=None):
+def run_baseline(task: str, run_id: str, task_id: str, task_bucket: str = "", *, log_event=None, usage=None):
     """
     Monolithic arm: single LLM call, no versonalities.
     If log_event is provided, events are emitted to logs/events.jsonl.
+    If usage (a dict) is provided, it accumulates calls, cached_tokens_in,
+    (with SWARM_MEMO or SWARM_LLM_CACHE) llm_cache_hits and (with SWARM_RATE_LIMIT_RETRIES) retries.
+    Each retry is also logged as a "retry" event.
     This pipeline does not invoke tools; when extending with tools, call log_event(..., tool="name", tool_ok=...).
     """
     messages = [{"role": "user", "content": task}]
+
+    def on_retry(n: int) -> None:
+        _record_retry(usage)
+        if log_event is not None:
+            log_event(
+                run_id=run_id,
+                task_id=task_id,
+                arm="monolith",
+                agent_id="monolith",
+                versonality="monolith",
+                phase="act",
+                event="retry",
+                task_bucket=task_bucket,
+                retry_count=n,
+            )
+
     if log_event is not None:
         log_event(
             run_id=run_id,
@@ -94,7 +380,8 @@ def run_baseline(task: str, run_id: str, task_id: str, task_bucket: str = "", *,
             event="message",
             task_bucket=task_bucket,
         )
-    content, ti, to = call_api(messages)
+    content, ti, to, cached, cache_hit = _chat(messages, on_retry=on_retry)
+    _record_usage(usage, cached, cache_hit)
     if log_event is not None:
         log_event(
             run_id=run_id,
@@ -111,57 +398,175 @@ def run_baseline(task: str, run_id: str, task_id: str, task_bucket: str = "", *,
     return content, ti, to
 
 
-def run_swarm(task: str, run_id: str, task_id: str, task_bucket: str = "", *, log_event=None):
+def _handoff_content(user_content: str, task: str, agent_ids: Tuple[str, ...], outputs: dict) -> str:
+    """User message for SWARM_CONTEXT=handoff: role line, task, the consumed prior outputs, then the instruction."""
+    needed: List[str] = []
+    for agent_id in agent_ids:
+        for src in _HANDOFF_INPUTS[agent_id]:
+            # Skip outputs produced in this same (fused) step, and duplicates from a fused earlier step.
+            if src in agent_ids or src not in outputs or any(outputs[n] == outputs[src] for n in needed):
+                continue
+            needed.append(src)
+    if not needed:
+        return user_content
+    role_line, _, instruction = user_content.partition("\n\n")
+    context = "\n\n".join(f"{_ROLES_BY_ID[src][2]} output:\n{outputs[src]}" for src in needed)
+    return f"{role_line}\n\nTask: {task}\n\n{context}\n\n{instruction}"
+
+
+def _final_section(content: str) -> str:
+    """Text after the last "### FINAL" heading of a SWARM_FUSE_FINAL reply (whole reply if it has none)."""
+    heading = None
+    for heading in _FINAL_HEADING_RE.finditer(content):
+        pass
+    return content[heading.end():].strip() if heading is not None else content
+
+
+class _FinalSectionStream:
+    """on_delta wrapper for the SWARM_FUSE_FINAL call: forwards only text after the first "### FINAL" heading."""
+
+    def __init__(self, on_delta):
+        self._on_delta = on_delta
+        self._head = ""  # reply text so far, until the heading line is complete
+        self._in_final = False
+        self._sent = False
+
+    def __call__(self, text: str) -> None:
+        if not self._in_final:
+            self._head += text
+            heading = _FINAL_HEADING_RE.search(self._head)
+            if heading is None or heading.end() == len(self._head):  # no heading yet, or its line may go on
+                return
+            self._in_final = True
+            text = self._head[heading.end():]
+            self._head = ""
+        if not self._sent:  # drop the blank lines between the heading and the answer
+            text = text.lstrip()
+            if not text:
+                return
+            self._sent = True
+        self._on_delta(text)
+
+
+def run_swarm(
+    task: str, run_id: str, task_id: str, task_bucket: str = "", *, log_event=None, usage=None, on_final_delta=None
+):
     """
     Swarm arm: Planner → Analyst → Builder → Critic → Builder → Editor.
     Uses SYSTEM_PROMPT and SWARM_ROLES. If log_event is provided, events are emitted to logs/events.jsonl.
+    With SWARM_FUSE_ROLES=1, Planner+Analyst and Critic+Builder each share one call (4 calls total);
+    events are still emitted per logical role, with a fused call's tokens attributed to its first role.
+    Adding SWARM_FUSE_FINAL=1 folds the Editor into the Critic+Builder call (3 calls) and returns its
+    "### FINAL" section.
+    With SWARM_CONTEXT=handoff, each call carries only the system prompt and one user message with
+    the task and the prior outputs that role consumes, instead of the whole conversation.
+    With SWARM_PARALLEL_PLAN=1, Planner and a task-only Analyst run concurrently; both outputs feed the Builder.
+    In full-context mode every call's prompt extends the previous one byte-for-byte (system prompt first,
+    role named only in the newest user turn), so provider prefix caching applies. If usage (a dict) is
+    provided, it accumulates calls, cached_tokens_in, (with SWARM_MEMO or SWARM_LLM_CACHE) llm_cache_hits
+    and (with SWARM_RATE_LIMIT_RETRIES) retries; each retry is also logged as a "retry" event.
+    If on_final_delta is provided, the final (Editor) call is streamed and on_final_delta(text) is
+    called with each chunk as it arrives, e.g. to render the answer progressively in the UI. Under
+    SWARM_FUSE_FINAL=1 only the text after the reply's "### FINAL" heading is passed on (nothing if
+    the model omits the heading; the returned answer is then the whole reply).
+    With SWARM_SKIP_APPROVED_REVISION=1, a Critic reply matching _APPROVAL_RE skips the Builder revision
+    (no call, no events) and the Editor works from the first Builder output; usage["early_exit"] records it.
+    With SWARM_STOP_ROLE_HOP=1, every call stops at a new "Role:" block (_ROLE_HOP_STOP).
+    With SWARM_SPECULATIVE_REVISION=1, a Builder revision runs concurrently with the Critic and replaces
+    the post-Critic revision when the Critic approves; usage["speculative_hit"] records whether it did.
     This pipeline does not invoke tools; when extending with tools, call log_event(..., tool="name", tool_ok=...).
     """
-    conversation = [{"role": "system", "content": SYSTEM_PROMPT}]
+    conversation = [_SYSTEM_MESSAGE]
     total_in, total_out = 0, 0
     final_content = ""
+    outputs = {}  # agent_id -> content, consumed by later roles under SWARM_CONTEXT=handoff
+    if FUSE_ROLES:
+        stages = _FUSED_FINAL_STAGES if FUSE_FINAL else _FUSED_STAGES
+    elif PARALLEL_PLAN:
+        stages = _PARALLEL_PLAN_STAGES
+    else:
+        stages = _V1_STAGES
+    skip_revision = False
+    stop = _ROLE_HOP_STOP if STOP_ROLE_HOP else None
+    speculate = SPECULATIVE_REVISION and not FUSE_ROLES and not SKIP_APPROVED_REVISION
+    if speculate:
+        stages = [stage + [_SPECULATIVE_REVISION_STEP] if stage == [_V1_STEPS[3]] else stage for stage in stages]
 
-    for agent_id, phase, role_name, instruction in SWARM_ROLES:
-        if agent_id == "builder2":
-            user_content = "Role: BUILDER\n\nRevise the output based on the critic's feedback."
-        elif agent_id == "editor":
-            user_content = f"Role: {role_name}\n\n{instruction}"
-        else:
-            if agent_id == "planner":
-                user_content = f"Role: {role_name}\n\nTask: {task}\n\n{instruction}"
-            else:
-                user_content = f"Role: {role_name}\n\n{instruction}"
+    def emit(agent_id: str, event: str, tokens_in: int = 0, tokens_out: int = 0, retry_count: int = 0) -> None:
+        _, phase, role_name, _ = _ROLES_BY_ID[agent_id]
+        log_event(
+            run_id=run_id,
+            task_id=task_id,
+            arm="swarm",
+            agent_id=agent_id,
+            versonality=role_name.lower(),
+            phase=phase,
+            event=event,
+            tokens_in=tokens_in,
+            tokens_out=tokens_out,
+            task_bucket=task_bucket,
+            retry_count=retry_count,
+        )
 
-        conversation.append({"role": "user", "content": user_content})
+    def on_retry(agent_id: str, n: int) -> None:
+        _record_retry(usage)
         if log_event is not None:
-            log_event(
-                run_id=run_id,
-                task_id=task_id,
-                arm="swarm",
-                agent_id=agent_id,
-                versonality=role_name.lower(),
-                phase=phase,
-                event="message",
-                task_bucket=task_bucket,
-            )
-        content, ti, to = call_api(conversation)
-        total_in += ti
-        total_out += to
+            emit(agent_id, "retry", retry_count=n)
+
+    for stage in stages:
+        if skip_revision and all(agent_ids == ("builder2",) for agent_ids, _ in stage):
+            outputs.setdefault("builder2", outputs["builder"])  # already set by a used speculative revision
+            continue
+        calls = []  # (agent_ids, user message, messages sent, speculative)
+        for step in stage:
+            agent_ids, template = step
+            user_content = template.format(task=task) if "{task}" in template else template
+            if HANDOFF_CONTEXT:
+                user_content = _handoff_content(user_content, task, agent_ids, outputs)
+            user_message = {"role": "user", "content": user_content}
+            messages = [conversation[0], user_message] if HANDOFF_CONTEXT else conversation + [user_message]
+            calls.append((agent_ids, user_message, messages, step is _SPECULATIVE_REVISION_STEP))
         if log_event is not None:
-            log_event(
-                run_id=run_id,
-                task_id=task_id,
-                arm="swarm",
-                agent_id=agent_id,
-                versonality=role_name.lower(),
-                phase=phase,
-                event="end",
-                tokens_in=ti,
-                tokens_out=to,
-                task_bucket=task_bucket,
-            )
-        conversation.append({"role": "assistant", "content": content})
-        final_content = content
+            for agent_ids, _, _, speculative in calls:
+                if not speculative:  # logged only if it is used
+                    for agent_id in agent_ids:
+                        emit(agent_id, "message")
+        if len(calls) == 1:
+            on_delta = on_final_delta if stage is stages[-1] else None
+            if on_delta is not None and stage[0] is _FUSED_FINAL_STEP:
+                on_delta = _FinalSectionStream(on_delta)
+            results = [_chat(calls[0][2], on_delta, stop, partial(on_retry, calls[0][0][0]))]
+        else:
+            results = list(_POOL.map(
+                _chat,
+                [messages for _, _, messages, _ in calls],
+                repeat(None),
+                repeat(stop),
+                [partial(on_retry, agent_ids[0]) for agent_ids, _, _, _ in calls],
+            ))
 
-    return final_content, total_in, total_out
+        for (agent_ids, user_message, _, speculative), (content, ti, to, cached, cache_hit) in zip(calls, results):
+            total_in += ti
+            total_out += to
+            _record_usage(usage, cached, cache_hit)
+            if speculative and not skip_revision:
+                continue  # the Critic asked for changes; drop the speculative revision (tokens already counted)
+            if log_event is not None:
+                for i, agent_id in enumerate(agent_ids):
+                    if speculative:
+                        emit(agent_id, "message")
+                    emit(agent_id, "end", ti if i == 0 else 0, to if i == 0 else 0)
+            if not HANDOFF_CONTEXT:
+                conversation.append(user_message)
+                conversation.append({"role": "assistant", "content": content})
+            for agent_id in agent_ids:
+                outputs[agent_id] = content
+            final_content = content
+            if len(agent_ids) > 1 and agent_ids[-1] == "editor":
+                final_content = outputs["editor"] = _final_section(content)
+            if (SKIP_APPROVED_REVISION or speculate) and agent_ids == ("critic",):
+                skip_revision = _APPROVAL_RE.search(content) is not None
+                if usage is not None:
+                    usage["speculative_hit" if speculate else "early_exit"] = skip_revision
 
+    return final_content, total_in, total_out
@@ -3,12 +3,18 @@ Event-level logging (JSONL) and run-summary persistence.
 No dashboards or advanced analytics.
 """
 
-import json
+import atexit
+import mmap
 import os
-from datetime import datetime, timezone
+import queue
+import struct
+import threading
+import time
 from enum import Enum
 from typing import Any, Optional
 
+from jsonio import dumps, loads
+
 # ---------------------------------------------------------------------------
 # Failure reason (exactly one per failed run)
 # ---------------------------------------------------------------------------
@@ -35,14 +41,259 @@ SUMMARIES_PATH = os.environ.get("SWARM_SUMMARIES_PATH", os.path.join(_LOGS_DIR,
 RUNS_PATH = os.environ.get("SWARM_RUNS_PATH", os.path.join(_LOGS_DIR, "runs.jsonl"))
 
 
+# Serializes appends so concurrent arms/tasks in one process never interleave JSONL lines.
+_APPEND_LOCK = threading.Lock()
+
+
+def _append_jsonl(path: str, obj: dict) -> None:
+    line = dumps(obj) + b"\n"
+    with _APPEND_LOCK:
+        with open(path, "ab") as f:
+            f.write(line)
+
+
+# Events are appended through one long-lived handle per path instead of an open/write/close per
+# event. SWARM_LOG_FLUSH_EVERY=N lets up to N events sit in the buffer between flushes (default 1:
+# every event is on disk when log_event returns); anything still buffered is flushed at exit.
+LOG_FLUSH_EVERY = max(1, int(os.environ.get("SWARM_LOG_FLUSH_EVERY", "1")))
+# Opt-in: SWARM_LOG_INDEX=1 also appends one (offset, length) record per event to "<events path>.idx",
+# so read_indexed_events can fetch rows by number without scanning the JSONL. The index covers
+# events written while it is on; it is reset when the events file is new or empty. Offsets come from
+# this process's handle, so it is only reliable with a single writing process: once another process
+# (app.py, a second batch_runner) appends, later records miss and read_indexed_events skips them.
+LOG_INDEX = os.environ.get("SWARM_LOG_INDEX", "0") == "1"
+_IDX_RECORD = struct.Struct("<QQ")  # byte offset of the JSON line, its length without the newline
+_EVENT_WRITERS: dict = {}  # path -> [append handle, events written since its last flush, .idx handle or None]
+
+
+def _event_writer(path: str) -> list:
+    """Open (or reuse) the append handle for path.
+
+    Deletion/rotation of the file is checked (stat + fstat) only when a flush window starts, i.e.
+    nothing is buffered, so it costs two syscalls per LOG_FLUSH_EVERY events rather than per event.
+    """
+    writer = _EVENT_WRITERS.get(path)
+    if writer is not None:
+        if writer[1]:
+            return writer
+        try:
+            if os.stat(path).st_ino == os.fstat(writer[0].fileno()).st_ino:
+                return writer
+        except OSError:
+            pass
+        writer[0].close()
+        if writer[2] is not None:
+            writer[2].close()
+    _ensure_dir(path)
+    handle = open(path, "ab")
+    index = None
+    if LOG_INDEX:
+        index = open(path + ".idx", "ab" if handle.tell() else "wb")
+    writer = _EVENT_WRITERS[path] = [handle, 0, index]
+    return writer
+
+
+def _index_records(offset: int, data: bytes) -> bytes:
+    """_IDX_RECORD entries for the JSONL lines in data, which is written at byte offset."""
+    records = []
+    start = 0
+    end = data.find(b"\n")
+    while end != -1:
+        records.append(_IDX_RECORD.pack(offset + start, end - start))
+        start = end + 1
+        end = data.find(b"\n", start)
+    return b"".join(records)
+
+
+def _write_events(path: str, data: bytes, n: int) -> None:
+    """Append n already-encoded JSONL events to path (caller holds _APPEND_LOCK)."""
+    writer = _event_writer(path)
+    if writer[2] is not None:
+        writer[2].write(_index_records(writer[0].tell(), data))
+    writer[0].write(data)
+    writer[1] += n
+    if writer[1] >= LOG_FLUSH_EVERY:
+        _flush_writer(writer)
+
+
+def _flush_writer(writer: list) -> None:
+    writer[0].flush()
+    if writer[2] is not None:
+        writer[2].flush()  # after the JSONL, so flushed index entries point at flushed lines
+    writer[1] = 0
+
+
+# log_event passes events around as flat tuples in this field order (no per-event dict);
+# _encode_events turns a batch of them into JSONL through one reused dict.
+_EVENT_ROW = (
+    "ts", "run_id", "task_id", "arm", "agent_id", "versonality", "phase", "event",
+    "tokens_in", "tokens_out", "tool", "tool_ok",
+    "task_bucket", "retry_count", "seed", "handoff_to",  # -> metadata
+)
+
+
+def _encode_events(rows: list) -> bytes:
+    """Encode _EVENT_ROW tuples as JSONL (same bytes as one dumps() per event dict)."""
+    obj: dict = dict.fromkeys(_EVENT_ROW[:12])
+    meta = obj["metadata"] = dict.fromkeys(_EVENT_ROW[12:])
+    lines = []
+    for row in rows:
+        (
+            obj["ts"], obj["run_id"], obj["task_id"], obj["arm"], obj["agent_id"], obj["versonality"],
+            obj["phase"], obj["event"], obj["tokens_in"], obj["tokens_out"], obj["tool"], obj["tool_ok"],
+            meta["task_bucket"], meta["retry_count"], meta["seed"], meta["handoff_to"],
+        ) = row
+        lines.append(dumps(obj))
+    lines.append(b"")
+    return b"\n".join(lines)
+
+
+def _append_event(path: str, row: tuple) -> None:
+    line = _encode_events([row])
+    with _APPEND_LOCK:
+        _write_events(path, line, 1)
+
+
+# Opt-in: SWARM_LOG_BACKGROUND=1 hands events to a writer thread, so JSON encoding and disk I/O happen
+# off the calling (agent) thread. When LOG_QUEUE_MAX events are already pending, new ones are dropped
+# and counted in EVENTS_DROPPED instead of blocking the caller.
+LOG_BACKGROUND = os.environ.get("SWARM_LOG_BACKGROUND", "0") == "1"
+LOG_QUEUE_MAX = 10000
+_LOG_BATCH = 256  # events per write() in the writer thread
+EVENTS_DROPPED = 0
+_EVENT_QUEUE: "queue.Queue[tuple]" = queue.Queue(maxsize=LOG_QUEUE_MAX)  # (path, _EVENT_ROW tuple)
+_WRITER_THREAD: Optional[threading.Thread] = None
+_WRITER_START_LOCK = threading.Lock()
+_DROP_LOCK = threading.Lock()
+
+
+def _count_dropped(n: int) -> None:
+    global EVENTS_DROPPED
+    with _DROP_LOCK:
+        EVENTS_DROPPED += n
+
+
+def _event_writer_loop() -> None:
+    while True:
+        batch = [_EVENT_QUEUE.get()]
+        while len(batch) < _LOG_BATCH:
+            try:
+                batch.append(_EVENT_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            by_path: dict = {}
+            for path, row in batch:
+                by_path.setdefault(path, []).append(row)
+            with _APPEND_LOCK:
+                for path, rows in by_path.items():
+                    try:
+                        data = _encode_events(rows)
+                    except Exception:  # e.g. TypeError for a value the encoder can't serialize
+                        data, rows = _encode_valid_events(rows)
+                    # Nothing may escape: a dead writer thread would lose every later event.
+                    try:
+                        _write_events(path, data, len(rows))
+                    except Exception:
+                        _count_dropped(len(rows))
+        finally:
+            for _ in batch:
+                _EVENT_QUEUE.task_done()
+
+
+def _encode_valid_events(rows: list) -> tuple:
+    """(JSONL bytes, rows kept) for the rows that encode on their own; the rest count as dropped."""
+    lines, kept = [], []
+    for row in rows:
+        try:
+            lines.append(_encode_events([row]))
+        except Exception:
+            _count_dropped(1)
+            continue
+        kept.append(row)
+    return b"".join(lines), kept
+
+
+def _enqueue_event(path: str, row: tuple) -> None:
+    global _WRITER_THREAD
+    if _WRITER_THREAD is None:
+        with _WRITER_START_LOCK:
+            if _WRITER_THREAD is None:
+                thread = threading.Thread(target=_event_writer_loop, name="event-writer", daemon=True)
+                thread.start()
+                _WRITER_THREAD = thread
+    try:
+        _EVENT_QUEUE.put_nowait((path, row))
+    except queue.Full:
+        _count_dropped(1)
+
+
+def flush_events() -> None:
+    """Write out queued events (SWARM_LOG_BACKGROUND) and flush buffered ones; also runs at exit."""
+    if _WRITER_THREAD is not None and _WRITER_THREAD.is_alive():  # a dead writer would never drain it
+        _EVENT_QUEUE.join()
+    with _APPEND_LOCK:
+        for writer in _EVENT_WRITERS.values():
+            _flush_writer(writer)
+
+
+atexit.register(flush_events)
+
+
+def read_indexed_events(path: Optional[str] = None, start: int = 0, stop: Optional[int] = None) -> list:
+    """Events start..stop (row numbers in the SWARM_LOG_INDEX index, slice semantics) as dicts.
+
+    Seeks straight to each row via "<path>.idx" instead of parsing the JSONL from the top.
+    Returns [] when there is no index. A record is used only if it spans exactly one complete line
+    that parses (newline before and after it); others are skipped: lines not on disk yet, and
+    records made stale by another process appending to the same file (see SWARM_LOG_INDEX).
+    """
+    path = path or EVENTS_PATH
+    try:
+        index_file = open(path + ".idx", "rb")
+    except FileNotFoundError:
+        return []
+    with index_file, open(path, "rb") as f:
+        size = os.fstat(index_file.fileno()).st_size
+        if size < _IDX_RECORD.size:
+            return []
+        events = []
+        with mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as index:
+            for row in range(size // _IDX_RECORD.size)[start:stop]:
+                offset, length = _IDX_RECORD.unpack_from(index, row * _IDX_RECORD.size)
+                start = max(offset - 1, 0)
+                f.seek(start)
+                chunk = f.read(offset - start + length + 1)
+                line = chunk[offset - start:offset - start + length]
+                if (offset and chunk[:1] != b"\n") or chunk[offset - start + length:] != b"\n":
+                    continue
+                try:
+                    event = loads(line)
+                except ValueError:
+                    continue
+                if isinstance(event, dict):
+                    events.append(event)
+        return events
+
+
 def _ensure_dir(path: str) -> None:
     d = os.path.dirname(path)
     if d:
         os.makedirs(d, exist_ok=True)
 
 
+# (whole UTC second, its formatted timestamp); events within one second reuse the string.
+_TS_CACHE = (-1, "")
+
+
 def _ts_utc() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    global _TS_CACHE
+    now = int(time.time())
+    second, text = _TS_CACHE  # one tuple read, so a concurrent update can't pair the wrong halves
+    if second != now:
+        text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _TS_CACHE = (now, text)
+    return text
 
 
 # ---------------------------------------------------------------------------
@@ -78,29 +329,15 @@ def log_event(
     phase, event, tokens_in/out, tool/tool_ok, metadata.{task_bucket, seed, retry_count, handoff_to}).
     """
     out = path or EVENTS_PATH
-    _ensure_dir(out)
-    obj = {
-        "ts": _ts_utc(),
-        "run_id": run_id,
-        "task_id": task_id,
-        "arm": arm,
-        "agent_id": agent_id,
-        "versonality": versonality,
-        "phase": phase,
-        "event": event,
-        "tokens_in": tokens_in,
-        "tokens_out": tokens_out,
-        "tool": tool,
-        "tool_ok": tool_ok,
-        "metadata": {
-            "task_bucket": task_bucket,
-            "retry_count": retry_count,
-            "seed": seed,
-            "handoff_to": handoff_to,
-        },
-    }
-    with open(out, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    row = (
+        _ts_utc(), run_id, task_id, arm, agent_id, versonality, phase, event,
+        tokens_in, tokens_out, tool, tool_ok,
+        task_bucket, retry_count, seed, handoff_to,
+    )
+    if LOG_BACKGROUND:
+        _enqueue_event(out, row)
+    else:
+        _append_event(out, row)
 
 
 # ---------------------------------------------------------------------------
@@ -128,12 +365,16 @@ def write_run_summary(
     policy_violation: bool = False,
     hallucination_critical: bool = False,
     wall_seconds: Optional[float] = None,
+    tokens_in_cached: Optional[int] = None,
+    cache_hit: Optional[bool] = None,
     tool_calls: int = 0,
     tool_calls_ok: int = 0,
     swarm_conflict: Optional[bool] = None,
     consensus_seconds: Optional[float] = None,
     handoffs: Optional[int] = None,
     duplicate_work: Optional[bool] = None,
+    early_exit: Optional[bool] = None,
+    speculative_hit: Optional[bool] = None,
     cost_model: float = 0.0,
     cost_tools: float = 0.0,
     path: Optional[str] = None,
@@ -144,8 +385,13 @@ def write_run_summary(
     - budgets {max_tokens, max_seconds}
     - outcome {success, failure_reason, policy_violation, hallucination_critical}
     - scores {quality, constraint_adherence}
-    - usage {wall_seconds, tokens_in, tokens_out, tool_calls, tool_calls_ok}
-    - swarm {conflict, consensus_seconds, handoffs, duplicate_work}
+    - usage {wall_seconds, tokens_in, tokens_out, tokens_in_cached, cache_hit, tool_calls, tool_calls_ok}
+      (tokens_in_cached: prompt tokens served from the provider's prefix cache; cache_hit: every call of
+      the arm was replayed from the local LLM response cache, so tokens/cost were not billed again;
+      both None if not tracked)
+    - swarm {conflict, consensus_seconds, handoffs, duplicate_work, early_exit, speculative_hit}
+      (early_exit: the Builder revision was skipped because the Critic approved; speculative_hit: the
+      speculative Builder revision was used because the Critic approved; None if not enabled)
     - cost_usd {model, tools, total}
     quality: 0–5 (manual input for now). failure_reason must be set iff success is False.
     """
@@ -156,12 +402,14 @@ def write_run_summary(
     out = path or SUMMARIES_PATH
     _ensure_dir(out)
     swarm_block: Optional[dict[str, Any]] = None
-    if any(v is not None for v in (swarm_conflict, consensus_seconds, handoffs, duplicate_work)):
+    if any(v is not None for v in (swarm_conflict, consensus_seconds, handoffs, duplicate_work, early_exit, speculative_hit)):
         swarm_block = {
             "conflict": swarm_conflict,
             "consensus_seconds": consensus_seconds,
             "handoffs": handoffs,
             "duplicate_work": duplicate_work,
+            "early_exit": early_exit,
+            "speculative_hit": speculative_hit,
         }
     obj: dict[str, Any] = {
         "run_id": run_id,
@@ -188,6 +436,8 @@ def write_run_summary(
             "wall_seconds": wall_seconds,
             "tokens_in": tokens_in,
             "tokens_out": tokens_out,
+            "tokens_in_cached": tokens_in_cached,
+            "cache_hit": cache_hit,
             "tool_calls": tool_calls,
             "tool_calls_ok": tool_calls_ok,
         },
@@ -199,5 +449,4 @@ def write_run_summary(
         },
         "retry_count": retry_count,
     }
-    with open(out, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    _append_jsonl(out, obj)